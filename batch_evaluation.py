@@ -0,0 +1,182 @@
+"""Module providing the evaluation of many positions at once: the static terms of
+all the boards are looked up and summed with NumPy, and the dynamic changes that
+cannot be vectorized (mobility, connections and exposure) are added board by board.
+Without NumPy, the boards are evaluated one at a time with the same results"""
+from cmath import inf
+from team import Team
+import board_encoding
+import evaluation
+from eval_cache import EVALUATION_CACHE
+from board_encoding import EMPTY, RED, BLACK, COLOUR_MASK, SQUARES, BOARD_SIZE_X, BOARD_SIZE_Y
+from piece_rules import VALUE_TABLES, VALUE_SCALE, NUMBER_OF_VALUE_PACKS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# [BEGIN TABLE BUILDERS]
+def _build_term_arrays(value_pack: int) -> tuple:
+    """This function builds the arrays of the static terms of every piece code on every
+    cell (x * 9 + y) in a value pack: the terms a and b signed by the team of the piece,
+    and the terms c of the red pieces and of the black pieces"""
+    shape = (COLOUR_MASK + 1, len(SQUARES))
+    a_array = numpy.zeros(shape, dtype=numpy.int64)
+    b_array = numpy.zeros(shape, dtype=numpy.int64)
+    c_red_array = numpy.zeros(shape, dtype=numpy.int64)
+    c_black_array = numpy.zeros(shape, dtype=numpy.int64)
+    for code, table in enumerate(VALUE_TABLES[value_pack]):
+        if table is None:
+            continue
+
+        for cell, square in enumerate(SQUARES):
+            a, b, c = table[square]
+            if code & RED:
+                a_array[code, cell], b_array[code, cell], c_red_array[code, cell] = a, b, c
+            else:
+                a_array[code, cell], b_array[code, cell], c_black_array[code, cell] = -a, -b, c
+
+    return a_array, b_array, c_red_array, c_black_array
+
+
+# [END TABLE BUILDERS]
+
+# [BEGIN TABLES]
+# Static terms of every value pack as arrays indexed by (piece code, cell)
+TERM_ARRAYS = None
+CELLS = None
+if numpy is not None:
+    TERM_ARRAYS = tuple(_build_term_arrays(value_pack) for value_pack in range(NUMBER_OF_VALUE_PACKS))
+    CELLS = numpy.arange(len(SQUARES))
+# [END TABLES]
+
+
+# [BEGIN FUNCTIONS]
+def to_board_array(boards: list):
+    """This function converts mailboxes to an (N, 10, 9) int8 array of piece codes
+    (nested lists without NumPy)"""
+    cells = [[board[square] for square in SQUARES] for board in boards]
+    if numpy is None:
+        return [
+            [board_cells[x * BOARD_SIZE_Y:(x + 1) * BOARD_SIZE_Y] for x in range(BOARD_SIZE_X)]
+            for board_cells in cells
+        ]
+
+    return numpy.array(cells, dtype=numpy.int8).reshape(len(cells), BOARD_SIZE_X, BOARD_SIZE_Y)
+
+
+def _to_mailbox(board_rows) -> tuple:
+    """This function converts the 10 rows of piece codes of a board to a mailbox
+    and returns it with the squares of the pieces of every team"""
+    board = board_encoding.create_empty_board()
+    piece_squares = {RED: [], BLACK: []}
+    for square, code in zip(SQUARES, (code for row in board_rows for code in row)):
+        if code != EMPTY:
+            board[square] = int(code)
+            piece_squares[int(code) & COLOUR_MASK].append(square)
+    return board, piece_squares
+
+
+def get_static_values(boards, value_pack: int) -> list:
+    """This function returns the static values of an (N, 10, 9) array of boards
+    (positive for the red team and negative for the black team)"""
+    if not 0 <= value_pack < NUMBER_OF_VALUE_PACKS:
+        raise ValueError("Value pack is not found")
+
+    # .Fallback: one board at a time
+    if numpy is None:
+        values = []
+        for board_rows in boards:
+            board, piece_squares = _to_mailbox(board_rows)
+            value_terms = evaluation.get_value_terms(board, piece_squares, value_pack)
+            values.append(
+                evaluation.get_static_value(value_terms, len(piece_squares[RED]), len(piece_squares[BLACK]))
+            )
+        return values
+
+    codes = numpy.asarray(boards, dtype=numpy.int64).reshape(-1, len(SQUARES))
+    a_array, b_array, c_red_array, c_black_array = TERM_ARRAYS[value_pack]
+
+    # .Look up the terms of every cell and sum them for every board
+    a = a_array[codes, CELLS].sum(axis=1)
+    b = b_array[codes, CELLS].sum(axis=1)
+    c_red = c_red_array[codes, CELLS].sum(axis=1)
+    c_black = c_black_array[codes, CELLS].sum(axis=1)
+
+    # .Count the pieces of every team
+    number_of_red_pieces = (codes & RED != 0).sum(axis=1)
+    number_of_black_pieces = (codes & BLACK != 0).sum(axis=1)
+
+    values = (
+        a
+        + b * (number_of_red_pieces + number_of_black_pieces)
+        + c_red * number_of_red_pieces
+        - c_black * number_of_black_pieces
+    ) / VALUE_SCALE
+    return values.tolist()
+
+
+def evaluate_boards(boards, value_pack: int) -> list:
+    """This function returns the values of an (N, 10, 9) array of boards in a value pack.
+    The side to move is not known, so the positions are not checked for a winner"""
+    values = get_static_values(boards, value_pack)
+
+    # The dynamic changes are added board by board
+    if evaluation.HAS_DYNAMIC_CHANGES[value_pack]:
+        for index, board_rows in enumerate(boards):
+            board, piece_squares = _to_mailbox(board_rows)
+            values[index] += evaluation.get_dynamic_value(board, piece_squares, value_pack, {})
+
+    return values
+
+
+def evaluate_game_states(game_states: list) -> list:
+    """This function returns the values of game states, equal to their value property,
+    and stores them in the game states. The static values that the game states
+    do not keep up to date are computed in one batch for every value pack"""
+    values = [None] * len(game_states)
+
+    # .Won positions and the values that are already known
+    batches = {}
+    for index, game_state in enumerate(game_states):
+        if game_state._value is None:
+            game_state._value = EVALUATION_CACHE.get(game_state.zobrist_key, game_state._value_pack)
+        if game_state._value is not None:
+            values[index] = game_state._value
+            continue
+
+        winner = game_state.status.winner
+        if winner is Team.RED:
+            values[index] = inf
+        elif winner is Team.BLACK:
+            values[index] = -inf
+        elif game_state._value_terms is not None:
+            values[index] = evaluation.get_static_value(
+                game_state._value_terms, game_state.number_of_red_pieces, game_state.number_of_black_pieces
+            )
+        else:
+            batches.setdefault(game_state._value_pack, []).append(index)
+
+    # .Static values of the other game states
+    for value_pack, indexes in batches.items():
+        boards = to_board_array([game_states[index].board for index in indexes])
+        for index, value in zip(indexes, get_static_values(boards, value_pack)):
+            values[index] = value
+
+    # .Dynamic changes, with the mobility known from the move generation
+    for index, game_state in enumerate(game_states):
+        if game_state._value is not None or abs(values[index]) == inf:
+            game_state._value = values[index]
+            continue
+
+        values[index] += evaluation.get_dynamic_value(
+            game_state.board, game_state.piece_squares, game_state._value_pack, game_state.status.mobility
+        )
+        game_state._value = values[index]
+        EVALUATION_CACHE.put(game_state.zobrist_key, game_state._value_pack, values[index])
+
+    return values
+
+
+# [END FUNCTIONS]
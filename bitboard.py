@@ -0,0 +1,346 @@
+"""Module providing the optional bitboard backend of the move generator"""
+import board_encoding
+from board_encoding import (
+    MAILBOX_SIZE, SQUARES, SQUARE_TO_POSITION, EMPTY, COLOUR_MASK, TYPE_MASK, RED, BLACK,
+    GENERAL, ADVISOR, ELEPHANT, HORSE, ROOK, CANNON, PAWN,
+)
+from move_tables import (
+    HORSE_MOVES, HORSE_ATTACKS, ELEPHANT_MOVES, ADVISOR_MOVES, GENERAL_MOVES, PAWN_MOVES,
+)
+
+# [BEGIN CONSTANTS]
+# Board size
+BOARD_SIZE_X = 10
+BOARD_SIZE_Y = 9
+
+# A bitboard is a 90-bit Python int, bit x * 9 + y is the position (x, y)
+FULL_BOARD = (1 << (BOARD_SIZE_X * BOARD_SIZE_Y)) - 1
+
+# Conversion between the mailbox squares and the bits
+SQUARE_TO_BIT = [None] * MAILBOX_SIZE
+BIT_TO_SQUARE = [None] * (BOARD_SIZE_X * BOARD_SIZE_Y)
+# (bitboard mask, row, bit on the rank occupancy, column, bit on the file occupancy)
+# of every mailbox square, used to move the pieces
+SQUARE_MASKS = [None] * MAILBOX_SIZE
+for _square in SQUARES:
+    _x, _y = SQUARE_TO_POSITION[_square]
+    SQUARE_TO_BIT[_square] = _x * BOARD_SIZE_Y + _y
+    BIT_TO_SQUARE[_x * BOARD_SIZE_Y + _y] = _square
+    SQUARE_MASKS[_square] = (1 << (_x * BOARD_SIZE_Y + _y), _x, 1 << _y, _y, 1 << _x)
+
+# [END CONSTANTS]
+
+
+# [BEGIN TABLE BUILDERS]
+def _scan_line(index: int, occupancy: int, length: int) -> tuple:
+    """This function scans a line (a rank or a file) from an index in both directions,
+    and returns the masks of the rook attacks and of the cannon captures on the line"""
+    rook_mask, cannon_mask = 0, 0
+    for step in (1, -1):
+        screen_found = False
+        position = index + step
+        while 0 <= position < length:
+            bit = 1 << position
+            if not screen_found:
+                # Every square until the first piece is attacked by the rook
+                rook_mask |= bit
+                if occupancy & bit:
+                    screen_found = True
+            elif occupancy & bit:
+                # The first piece behind the screen is attacked by the cannon
+                cannon_mask |= bit
+                break
+            position += step
+    return rook_mask, cannon_mask
+
+
+def _build_rank_tables() -> tuple:
+    """This function builds the rook and cannon attacks on a rank,
+    indexed by the column and the 9-bit occupancy of the rank"""
+    rook_table, cannon_table = [], []
+    for y in range(BOARD_SIZE_Y):
+        rook_row, cannon_row = [], []
+        for occupancy in range(1 << BOARD_SIZE_Y):
+            rook_mask, cannon_mask = _scan_line(y, occupancy, BOARD_SIZE_Y)
+            rook_row.append(rook_mask)
+            cannon_row.append(cannon_mask)
+        rook_table.append(rook_row)
+        cannon_table.append(cannon_row)
+    return rook_table, cannon_table
+
+
+def _spread_file_mask(mask: int) -> int:
+    """This function places a 10-bit file mask on the first column of a bitboard"""
+    bitboard = 0
+    for x in range(BOARD_SIZE_X):
+        if mask & (1 << x):
+            bitboard |= 1 << (x * BOARD_SIZE_Y)
+    return bitboard
+
+
+def _build_file_tables() -> tuple:
+    """This function builds the rook and cannon attacks on a file,
+    indexed by the row and the 10-bit occupancy of the file. The attacks are
+    placed on the first column and must be shifted by the column of the piece"""
+    rook_table, cannon_table = [], []
+    for x in range(BOARD_SIZE_X):
+        rook_row, cannon_row = [], []
+        for occupancy in range(1 << BOARD_SIZE_X):
+            rook_mask, cannon_mask = _scan_line(x, occupancy, BOARD_SIZE_X)
+            rook_row.append(_spread_file_mask(rook_mask))
+            cannon_row.append(_spread_file_mask(cannon_mask))
+        rook_table.append(rook_row)
+        cannon_table.append(cannon_row)
+    return rook_table, cannon_table
+
+
+def _to_bit_masks(table: list) -> list:
+    """This function converts a per-square table of goal squares to per-bit goal masks"""
+    masks = [0] * (BOARD_SIZE_X * BOARD_SIZE_Y)
+    for square in SQUARES:
+        for goal in table[square]:
+            masks[SQUARE_TO_BIT[square]] |= 1 << SQUARE_TO_BIT[goal]
+    return masks
+
+
+def _to_bit_pairs(table: list) -> list:
+    """This function converts a per-square table of (goal, block) squares
+    to per-bit (goal mask, block mask) pairs"""
+    pairs = [()] * (BOARD_SIZE_X * BOARD_SIZE_Y)
+    for square in SQUARES:
+        pairs[SQUARE_TO_BIT[square]] = tuple(
+            (1 << SQUARE_TO_BIT[goal], 1 << SQUARE_TO_BIT[block])
+            for goal, block in table[square]
+        )
+    return pairs
+
+
+def _build_pawn_attackers(colour: int) -> list:
+    """This function builds, for every bit, the mask of the squares
+    from which a pawn of a team attacks it"""
+    attackers = [0] * (BOARD_SIZE_X * BOARD_SIZE_Y)
+    for square in SQUARES:
+        for goal in PAWN_MOVES[colour][square]:
+            attackers[SQUARE_TO_BIT[goal]] |= 1 << SQUARE_TO_BIT[square]
+    return attackers
+
+
+# [END TABLE BUILDERS]
+
+# [BEGIN TABLES]
+RANK_ROOK_ATTACKS, RANK_CANNON_CAPTURES = _build_rank_tables()
+FILE_ROOK_ATTACKS, FILE_CANNON_CAPTURES = _build_file_tables()
+HORSE_PAIRS = _to_bit_pairs(HORSE_MOVES)
+HORSE_ATTACK_PAIRS = _to_bit_pairs(HORSE_ATTACKS)
+ELEPHANT_PAIRS = {RED: _to_bit_pairs(ELEPHANT_MOVES[RED]), BLACK: _to_bit_pairs(ELEPHANT_MOVES[BLACK])}
+ADVISOR_MASKS = _to_bit_masks(ADVISOR_MOVES)
+GENERAL_MASKS = _to_bit_masks(GENERAL_MOVES)
+PAWN_MASKS = {RED: _to_bit_masks(PAWN_MOVES[RED]), BLACK: _to_bit_masks(PAWN_MOVES[BLACK])}
+PAWN_ATTACKERS = {RED: _build_pawn_attackers(RED), BLACK: _build_pawn_attackers(BLACK)}
+# [END TABLES]
+
+
+class Bitboards:
+    """This class represents a position as one bitboard per piece code,
+    with the occupancy of every team, every rank and every file"""
+
+    __slots__ = ("pieces", "occupancy", "rank_occupancy", "file_occupancy")
+
+    # [BEGIN INITIALIZATION]
+    def __init__(
+        self, pieces: list, occupancy: list, rank_occupancy: list, file_occupancy: list
+    ) -> None:
+        # Bitboard of every piece code, and of every colour (indexed by the colour bit)
+        self.pieces = pieces
+        self.occupancy = occupancy
+
+        # 9-bit occupancy of every rank and 10-bit occupancy of every file
+        self.rank_occupancy = rank_occupancy
+        self.file_occupancy = file_occupancy
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    # Class method
+    @classmethod
+    def from_board(cls, board: list):
+        """This method builds the bitboards of a mailbox board"""
+        pieces = [0] * (COLOUR_MASK + 1)
+        occupancy = [0] * (COLOUR_MASK + 1)
+        rank_occupancy = [0] * BOARD_SIZE_X
+        file_occupancy = [0] * BOARD_SIZE_Y
+
+        for square in SQUARES:
+            code = board[square]
+            if code == EMPTY:
+                continue
+
+            bit = SQUARE_TO_BIT[square]
+            x, y = SQUARE_TO_POSITION[square]
+            pieces[code] |= 1 << bit
+            occupancy[code & COLOUR_MASK] |= 1 << bit
+            rank_occupancy[x] |= 1 << y
+            file_occupancy[y] |= 1 << x
+
+        return cls(pieces, occupancy, rank_occupancy, file_occupancy)
+
+    # Instance methods
+    def copy(self):
+        """This method returns an independent copy of the bitboards"""
+        return Bitboards(
+            list(self.pieces),
+            list(self.occupancy),
+            list(self.rank_occupancy),
+            list(self.file_occupancy),
+        )
+
+    def apply_move(self, old_square: int, new_square: int, moved_code: int, captured_code: int) -> None:
+        """This method moves a piece on the bitboards. Every update is an XOR,
+        so applying the same move again takes it back"""
+        old_mask, old_x, old_rank_bit, old_y, old_file_bit = SQUARE_MASKS[old_square]
+        new_mask, new_x, new_rank_bit, new_y, new_file_bit = SQUARE_MASKS[new_square]
+        pieces = self.pieces
+        occupancy = self.occupancy
+
+        # Move the piece
+        pieces[moved_code] ^= old_mask | new_mask
+        occupancy[moved_code & COLOUR_MASK] ^= old_mask | new_mask
+        self.rank_occupancy[old_x] ^= old_rank_bit
+        self.file_occupancy[old_y] ^= old_file_bit
+
+        # Remove the captured piece, or occupy the empty new square
+        if captured_code != EMPTY:
+            pieces[captured_code] ^= new_mask
+            occupancy[captured_code & COLOUR_MASK] ^= new_mask
+        else:
+            self.rank_occupancy[new_x] ^= new_rank_bit
+            self.file_occupancy[new_y] ^= new_file_bit
+
+    def _get_line_attacks(self, bit: int, rank_table: list, file_table: list) -> int:
+        """This method returns the attacks of a bit on its rank and its file"""
+        x, y = divmod(bit, BOARD_SIZE_Y)
+        return (
+            rank_table[y][self.rank_occupancy[x]] << (x * BOARD_SIZE_Y)
+            | file_table[x][self.file_occupancy[y]] << y
+        )
+
+    def get_piece_targets(self, bit: int, code: int) -> int:
+        """This method returns the bitboard of the admissible targets of a piece"""
+        colour = code & COLOUR_MASK
+        own = self.occupancy[colour]
+        piece_type = code & TYPE_MASK
+
+        if piece_type == ROOK:
+            return self._get_line_attacks(bit, RANK_ROOK_ATTACKS, FILE_ROOK_ATTACKS) & ~own
+
+        if piece_type == CANNON:
+            everything = own | self.occupancy[colour ^ COLOUR_MASK]
+            quiet = self._get_line_attacks(bit, RANK_ROOK_ATTACKS, FILE_ROOK_ATTACKS) & ~everything
+            captures = self._get_line_attacks(bit, RANK_CANNON_CAPTURES, FILE_CANNON_CAPTURES)
+            return quiet | captures & self.occupancy[colour ^ COLOUR_MASK]
+
+        if piece_type == HORSE or piece_type == ELEPHANT:
+            everything = own | self.occupancy[colour ^ COLOUR_MASK]
+            pairs = HORSE_PAIRS[bit] if piece_type == HORSE else ELEPHANT_PAIRS[colour][bit]
+            targets = 0
+            for goal_mask, block_mask in pairs:
+                if not everything & block_mask:
+                    targets |= goal_mask
+            return targets & ~own
+
+        if piece_type == ADVISOR:
+            return ADVISOR_MASKS[bit] & ~own
+
+        if piece_type == GENERAL:
+            return GENERAL_MASKS[bit] & ~own
+
+        return PAWN_MASKS[colour][bit] & ~own
+
+    def generate_piece_moves(self, square: int, code: int) -> list:
+        """This method returns the admissible target squares (mailbox) of a piece"""
+        targets = self.get_piece_targets(SQUARE_TO_BIT[square], code)
+        moves = []
+        while targets:
+            low = targets & -targets
+            moves.append(BIT_TO_SQUARE[low.bit_length() - 1])
+            targets ^= low
+        return moves
+
+    def generate_moves(self, colour: int) -> list:
+        """This method returns the admissible moves (pairs of mailbox squares) of a team"""
+        moves = []
+        for piece_type in range(GENERAL, PAWN + 1):
+            code = colour | piece_type
+            bits = self.pieces[code]
+            while bits:
+                low = bits & -bits
+                bit = low.bit_length() - 1
+                bits ^= low
+
+                square = BIT_TO_SQUARE[bit]
+                targets = self.get_piece_targets(bit, code)
+                while targets:
+                    low = targets & -targets
+                    moves.append((square, BIT_TO_SQUARE[low.bit_length() - 1]))
+                    targets ^= low
+        return moves
+
+    def is_general_exposed(self, colour: int) -> bool:
+        """This method returns True if the general of a team is exposed"""
+        enemy = colour ^ COLOUR_MASK
+        pieces = self.pieces
+        bit = pieces[colour | GENERAL].bit_length() - 1
+
+        # .Check the rook, and the opponent's general on the file
+        rook_attacks = self._get_line_attacks(bit, RANK_ROOK_ATTACKS, FILE_ROOK_ATTACKS)
+        if rook_attacks & (pieces[enemy | ROOK] | pieces[enemy | GENERAL]):
+            return True
+
+        # .Check the cannon
+        cannon_attacks = self._get_line_attacks(bit, RANK_CANNON_CAPTURES, FILE_CANNON_CAPTURES)
+        if cannon_attacks & pieces[enemy | CANNON]:
+            return True
+
+        # .Check the pawn
+        if PAWN_ATTACKERS[enemy][bit] & pieces[enemy | PAWN]:
+            return True
+
+        # .Check the horse
+        horses = pieces[enemy | HORSE]
+        if horses:
+            everything = self.occupancy[colour] | self.occupancy[enemy]
+            for horse_mask, leg_mask in HORSE_ATTACK_PAIRS[bit]:
+                if horses & horse_mask and not everything & leg_mask:
+                    return True
+
+        return False
+
+    # [END METHODS]
+
+
+def verify_against_mailbox(board: list) -> bool:
+    """This function returns True if the bitboard generator gives exactly
+    the same moves and general exposures as the mailbox generator on a board"""
+    # Imported here because the piece module is only needed for the verification
+    from piece import General, Piece
+
+    bitboards = Bitboards.from_board(board)
+    for colour in (RED, BLACK):
+        team = board_encoding.COLOUR_TO_TEAM[colour]
+        mailbox_moves = set()
+        for square in SQUARES:
+            code = board[square]
+            if code & colour:
+                piece = Piece.create_instance(
+                    SQUARE_TO_POSITION[square], code, board, 32, 16
+                )
+                mailbox_moves.update((square, goal) for goal in piece.admissible_moves)
+
+        if mailbox_moves != set(bitboards.generate_moves(colour)):
+            return False
+
+        opponent = board_encoding.COLOUR_TO_TEAM[colour ^ COLOUR_MASK]
+        if General.is_general_exposed(board, team, opponent) != bitboards.is_general_exposed(colour):
+            return False
+
+    return True
@@ -0,0 +1,188 @@
+"""Module providing the integer-coded padded mailbox representation of the board"""
+from team import Team
+
+# [BEGIN CONSTANTS]
+# Board size
+BOARD_SIZE_X = 10
+BOARD_SIZE_Y = 9
+
+# Padding: two sentinel rows above and below the board, and two sentinel
+# columns on the right of every row. Moving left from the first column wraps
+# into the padding of the previous row, so the two columns guard both sides.
+PADDING = 2
+ROW_STRIDE = BOARD_SIZE_Y + PADDING
+MAILBOX_SIZE = (BOARD_SIZE_X + 2 * PADDING) * ROW_STRIDE
+
+# Piece types (the lowest three bits of a piece code)
+GENERAL = 1
+ADVISOR = 2
+ELEPHANT = 3
+HORSE = 4
+ROOK = 5
+CANNON = 6
+PAWN = 7
+TYPE_MASK = 7
+
+# Team colours (one bit per team)
+RED = 8
+BLACK = 16
+COLOUR_MASK = RED | BLACK
+
+# Special codes
+EMPTY = 0
+# The sentinel carries both colour bits, so it is a "teammate" of every piece:
+# a target square is admissible iff (code & own colour) == 0
+OFFBOARD = RED | BLACK
+
+# Conversion tables between the notation and the codes
+_TYPE_LETTERS = {
+    "G": GENERAL,
+    "A": ADVISOR,
+    "E": ELEPHANT,
+    "H": HORSE,
+    "R": ROOK,
+    "C": CANNON,
+    "P": PAWN,
+}
+_COLOUR_LETTERS = {"R": RED, "B": BLACK}
+
+NOTATION_TO_CODE = {"NN": EMPTY}
+for _colour_letter, _colour in _COLOUR_LETTERS.items():
+    for _type_letter, _piece_type in _TYPE_LETTERS.items():
+        NOTATION_TO_CODE[_colour_letter + _type_letter] = _colour | _piece_type
+CODE_TO_NOTATION = {code: notation for notation, code in NOTATION_TO_CODE.items()}
+
+# Letters of the pieces in the FEN notation (upper case for the red team);
+# the aliases used by some programs are accepted as well
+_FEN_LETTERS = {
+    "K": GENERAL,
+    "A": ADVISOR,
+    "B": ELEPHANT,
+    "N": HORSE,
+    "R": ROOK,
+    "C": CANNON,
+    "P": PAWN,
+}
+_FEN_ALIASES = {"G": GENERAL, "E": ELEPHANT, "H": HORSE}
+_TYPE_TO_FEN_LETTER = {piece_type: letter for letter, piece_type in _FEN_LETTERS.items()}
+
+TEAM_TO_COLOUR = {Team.RED: RED, Team.BLACK: BLACK}
+COLOUR_TO_TEAM = {RED: Team.RED, BLACK: Team.BLACK}
+
+# Square tables
+# .All playable squares in row-major order (the order of the old 2D board)
+SQUARES = tuple(
+    (x + PADDING) * ROW_STRIDE + y
+    for x in range(BOARD_SIZE_X)
+    for y in range(BOARD_SIZE_Y)
+)
+# .Board position (x, y) of every square, None for the sentinel squares
+SQUARE_TO_POSITION = [None] * MAILBOX_SIZE
+# .True if the square is inside one of the two palaces
+IN_PALACE = [False] * MAILBOX_SIZE
+for _x in range(BOARD_SIZE_X):
+    for _y in range(BOARD_SIZE_Y):
+        _square = (_x + PADDING) * ROW_STRIDE + _y
+        SQUARE_TO_POSITION[_square] = (_x, _y)
+        IN_PALACE[_square] = (_x <= 2 or _x >= 7) and 3 <= _y <= 5
+# .The first square of the red half (the rows 5 to 9); black squares are below
+RIVER_SQUARE = (5 + PADDING) * ROW_STRIDE
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def to_square(position: tuple) -> int:
+    """This function returns the mailbox square of a board position (x, y)"""
+    return (position[0] + PADDING) * ROW_STRIDE + position[1]
+
+
+def get_team(code: int) -> Team:
+    """This function returns the team of a piece code (Team.NONE for an empty square)"""
+    if code & RED:
+        return Team.RED
+    if code & BLACK:
+        return Team.BLACK
+    return Team.NONE
+
+
+def create_empty_board() -> list:
+    """This function returns an empty mailbox surrounded by sentinel squares"""
+    board = [OFFBOARD] * MAILBOX_SIZE
+    for square in SQUARES:
+        board[square] = EMPTY
+    return board
+
+
+def from_notation_board(notation_board: list) -> list:
+    """This function converts a 10x9 board of notations ("RR", "NN", ...) to a mailbox"""
+    board = create_empty_board()
+    for x in range(BOARD_SIZE_X):
+        for y in range(BOARD_SIZE_Y):
+            board[to_square((x, y))] = NOTATION_TO_CODE[notation_board[x][y]]
+    return board
+
+
+def to_notation_board(board: list) -> list:
+    """This function converts a mailbox to a 10x9 board of notations"""
+    return [
+        [CODE_TO_NOTATION[board[to_square((x, y))]] for y in range(BOARD_SIZE_Y)]
+        for x in range(BOARD_SIZE_X)
+    ]
+
+
+def from_fen(fen: str) -> tuple:
+    """This function converts a FEN string (the first row is the black side)
+    to a mailbox and the team to move"""
+    fields = fen.split()
+    rows = fields[0].split("/")
+    if len(rows) != BOARD_SIZE_X:
+        raise ValueError("The FEN must have 10 rows")
+
+    board = create_empty_board()
+    for x, row in enumerate(rows):
+        y = 0
+        for letter in row:
+            if letter.isdigit():
+                y += int(letter)
+                continue
+
+            piece_type = _FEN_LETTERS.get(letter.upper(), _FEN_ALIASES.get(letter.upper()))
+            if piece_type is None or y >= BOARD_SIZE_Y:
+                raise ValueError("Invalid FEN row: " + row)
+            board[to_square((x, y))] = (RED if letter.isupper() else BLACK) | piece_type
+            y += 1
+
+        if y != BOARD_SIZE_Y:
+            raise ValueError("Invalid FEN row: " + row)
+
+    # The red team moves first if the side to move is not given
+    side = fields[1].lower() if len(fields) > 1 else "w"
+    return board, Team.BLACK if side == "b" else Team.RED
+
+
+def to_fen(board: list, current_team: Team) -> str:
+    """This function converts a mailbox and the team to move to a FEN string"""
+    rows = []
+    for x in range(BOARD_SIZE_X):
+        row, empty_count = "", 0
+        for y in range(BOARD_SIZE_Y):
+            code = board[to_square((x, y))]
+            if code == EMPTY:
+                empty_count += 1
+                continue
+
+            if empty_count:
+                row += str(empty_count)
+                empty_count = 0
+            letter = _TYPE_TO_FEN_LETTER[code & TYPE_MASK]
+            row += letter if code & RED else letter.lower()
+
+        if empty_count:
+            row += str(empty_count)
+        rows.append(row)
+
+    return "/".join(rows) + (" b" if current_team is Team.BLACK else " w")
+
+
+# [END FUNCTIONS]
@@ -0,0 +1,128 @@
+"""Module providing the process-wide cache of the evaluation values,
+keyed by the Zobrist key of a position and the value pack"""
+import os
+from collections import OrderedDict
+from piece_rules import NUMBER_OF_VALUE_PACKS
+
+
+class EvaluationCache:
+    """This class represents a size-bounded cache of evaluation values with a least
+    recently used eviction. It counts its hits, misses and evictions"""
+
+    # [BEGIN CONSTANTS]
+    # Estimated memory of an entry (key, value and link of the ordered dictionary) in bytes
+    ENTRY_SIZE = 200
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self, max_megabytes: float) -> None:
+        self._entries = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.max_megabytes = max_megabytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return "{} entries, {} hits, {} misses, {} evictions, hit rate {:.1%}".format(
+            len(self._entries), self.hits, self.misses, self.evictions, self.hit_rate
+        )
+
+    # Properties initialization
+    # .max_megabytes
+    @property
+    def max_megabytes(self) -> float:
+        """This is the Getter function of the memory cap in megabytes"""
+        return self._max_megabytes
+
+    @max_megabytes.setter
+    def max_megabytes(self, max_megabytes: float) -> None:
+        """This is the Setter function of the memory cap in megabytes
+        (0 disables the cache); the oldest entries over the cap are evicted"""
+        if max_megabytes < 0:
+            raise ValueError("The memory cap must not be negative")
+
+        self._max_megabytes = max_megabytes
+        self._max_entries = int(max_megabytes * 1024 * 1024 // self.ENTRY_SIZE)
+        self._evict()
+
+    # .hit_rate
+    @property
+    def hit_rate(self) -> float:
+        """This is the Getter function of the ratio of the lookups that hit"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    # .statistics
+    @property
+    def statistics(self) -> dict:
+        """This is the Getter function of the counters of the cache"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def get(self, zobrist_key: int, value_pack: int) -> float:
+        """This method returns the cached value of a position, or None if it is not cached"""
+        key = zobrist_key * NUMBER_OF_VALUE_PACKS + value_pack
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, zobrist_key: int, value_pack: int, value: float) -> None:
+        """This method caches the value of a position"""
+        if self._max_entries == 0:
+            return
+
+        key = zobrist_key * NUMBER_OF_VALUE_PACKS + value_pack
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._evict()
+
+    def clear(self) -> None:
+        """This method removes every entry and resets the statistics"""
+        self._entries.clear()
+        self.reset_statistics()
+
+    def reset_statistics(self) -> None:
+        """This method resets the counters of hits, misses and evictions"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self) -> None:
+        """This method evicts the least recently used entries over the cap"""
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # [END METHODS]
+
+
+# [BEGIN CONSTANTS]
+# Default memory cap of the process-wide cache in megabytes,
+# which can be set with the XIANGQI_EVAL_CACHE_MB environment variable
+DEFAULT_MAX_MEGABYTES = 64
+
+# Process-wide cache used by the game states
+EVALUATION_CACHE = EvaluationCache(float(os.environ.get("XIANGQI_EVAL_CACHE_MB", DEFAULT_MAX_MEGABYTES)))
+
+# [END CONSTANTS]
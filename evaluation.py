@@ -0,0 +1,120 @@
+"""Module providing the incremental evaluation of a position: the static terms of
+the pieces are read from the compiled tables of piece_rules.py and updated by
+deltas on every move, and only the dynamic changes are computed at evaluation"""
+from board_encoding import EMPTY, RED, TYPE_MASK
+from piece_rules import VALUE_TABLES, CHANGE_TABLES, VALUE_SCALE, NUMBER_OF_VALUE_PACKS
+
+
+# [BEGIN CONSTANTS]
+# True for the value packs with dynamic changes
+HAS_DYNAMIC_CHANGES = tuple(
+    any(change_function is not None for change_function in change_functions)
+    for change_functions in CHANGE_TABLES
+)
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+# The value terms of a position are a tuple (a, b, c_red, c_black) of integers in
+# 1/VALUE_SCALE of a point: a and b are the sums of the static terms of the red pieces
+# minus those of the black pieces, and c_red and c_black the sums of the terms of every team
+# multiplied by its number of pieces (see piece_rules.py)
+def get_value_terms(board: list, piece_squares: dict, value_pack: int) -> tuple:
+    """This function returns the value terms of a position computed from scratch"""
+    if not 0 <= value_pack < NUMBER_OF_VALUE_PACKS:
+        raise ValueError("Value pack is not found")
+
+    tables = VALUE_TABLES[value_pack]
+    a = b = c_red = c_black = 0
+    for colour, squares in piece_squares.items():
+        for square in squares:
+            terms = tables[board[square]][square]
+            if colour == RED:
+                a += terms[0]
+                b += terms[1]
+                c_red += terms[2]
+            else:
+                a -= terms[0]
+                b -= terms[1]
+                c_black += terms[2]
+
+    return a, b, c_red, c_black
+
+
+def update_value_terms(
+    value_terms: tuple,
+    value_pack: int,
+    moved_code: int,
+    captured_code: int,
+    old_square: int,
+    new_square: int,
+) -> tuple:
+    """This function returns the value terms of a position after a move
+    (the moved piece changes square and the captured piece is removed)"""
+    a, b, c_red, c_black = value_terms
+    tables = VALUE_TABLES[value_pack]
+
+    moved_table = tables[moved_code]
+    old_terms = moved_table[old_square]
+    new_terms = moved_table[new_square]
+    if moved_code & RED:
+        a += new_terms[0] - old_terms[0]
+        b += new_terms[1] - old_terms[1]
+        c_red += new_terms[2] - old_terms[2]
+    else:
+        a -= new_terms[0] - old_terms[0]
+        b -= new_terms[1] - old_terms[1]
+        c_black += new_terms[2] - old_terms[2]
+
+    if captured_code != EMPTY:
+        captured_terms = tables[captured_code][new_square]
+        if captured_code & RED:
+            a -= captured_terms[0]
+            b -= captured_terms[1]
+            c_red -= captured_terms[2]
+        else:
+            a += captured_terms[0]
+            b += captured_terms[1]
+            c_black -= captured_terms[2]
+
+    return a, b, c_red, c_black
+
+
+def get_static_value(value_terms: tuple, number_of_red_pieces: int, number_of_black_pieces: int) -> float:
+    """This function returns the static part of the value of a position
+    (positive for the red team and negative for the black team)"""
+    a, b, c_red, c_black = value_terms
+    return (
+        a
+        + b * (number_of_red_pieces + number_of_black_pieces)
+        + c_red * number_of_red_pieces
+        - c_black * number_of_black_pieces
+    ) / VALUE_SCALE
+
+
+def get_dynamic_value(board: list, piece_squares: dict, value_pack: int, mobility: dict) -> float:
+    """This function returns the dynamic part of the value of a position, the sum of
+    the dynamic changes of the pieces (mobility, connections and exposure).
+    The mobility of some pieces can be given, keyed by square"""
+    if not HAS_DYNAMIC_CHANGES[value_pack]:
+        return 0
+
+    change_functions = CHANGE_TABLES[value_pack]
+    value = 0
+    for colour, squares in piece_squares.items():
+        for square in squares:
+            change_function = change_functions[board[square] & TYPE_MASK]
+            if change_function is None:
+                continue
+
+            change = change_function(board, square, colour, mobility.get(square))
+            if colour == RED:
+                value += change
+            else:
+                value -= change
+
+    return value
+
+
+# [END FUNCTIONS]
@@ -1,310 +1,602 @@
-# Made by: Veil
-"""Module providing the property of game state"""
-from cmath import inf
-from random import shuffle
-from piece import General, Piece
-from team import Team
-
-
-class GameState:
-    """This class respresents the state of game containing
-    information and transforming method"""
-
-    # [BEGIN CONSTANTS]
-    # Board size
-    BOARD_SIZE_X = 10
-    BOARD_SIZE_Y = 9
-    # Limit for repeated moves
-    MAX_PERPETUAL = 3
-
-    # [BEGIN INITILIZATION]
-    def __init__(
-        self,
-        board: list,
-        current_team: Team,
-        move_history: dict,
-        value_pack: int = 0,
-        number_of_red_pieces: int = 16,
-        number_of_black_pieces: int = 16,
-    ) -> None:
-        self.board = board
-        self.move_history = move_history
-        self.number_of_red_pieces = number_of_red_pieces
-        self.number_of_black_pieces = number_of_black_pieces
-
-        self._value_pack = value_pack
-        self._value = None
-        self._current_team = current_team
-        self._all_child_gamestates = None
-
-    # Properties initialization
-    # .value
-    @property
-    def value(self) -> float:
-        """This is the Getter function of the value property,
-        return the value of the game state using chess pieces value"""
-
-        if self._value is None:
-            self._value = self._get_game_state_value()
-
-        return self._value
-
-    # .all_child_gamestates
-    @property
-    def all_child_gamestates(self) -> list:
-        """This is the Getter function of the list of child game states"""
-
-        if self._all_child_gamestates is None:
-            self._all_child_gamestates = self.generate_all_game_states()
-
-        return self._all_child_gamestates
-
-    # [END INITILIZATION]
-
-    # [BEGIN METHOD]
-    # Instance method
-    def _get_game_state_value(self) -> float:
-        """Return the evaluation value of the board"""
-        # Return the value of a game state when a team wins
-        if self.get_team_win() is Team.RED:
-            return inf
-
-        if self.get_team_win() is Team.BLACK:
-            return -inf
-
-        current_value = 0
-        # Iterate through all the positions on the board
-        for i in range(self.BOARD_SIZE_X):
-            for j in range(self.BOARD_SIZE_Y):
-                # Get the notation of the position
-                notation = self.board[i][j]
-                # If the notation is empty, then skip
-                if notation == "NN":
-                    continue
-
-                # Otherwise, create an instance of the piece and take value of that piece
-                piece = Piece.create_instance(
-                    (i, j),
-                    notation,
-                    self.board,
-                    self.number_of_black_pieces + self.number_of_red_pieces,
-                    self._get_number_of_team_pieces(Team[notation[0]]),
-                )
-                current_value += piece.piece_value(self._value_pack) * piece.team.value
-
-        return current_value
-
-    def _get_the_opponent_team(self) -> Team:
-        """This method returns the opponent's team in the game state"""
-        if self._current_team is Team.BLACK:
-            return Team.RED
-        else:
-            return Team.BLACK
-
-    def _get_number_of_team_pieces(self, team) -> int:
-        """This method returns the number of pieces of a team"""
-        if team is Team.BLACK:
-            return self.number_of_black_pieces
-        else:
-            return self.number_of_red_pieces
-
-    def generate_game_state_with_move(self, old_pos: tuple, new_pos: tuple):
-        """This method creates a game state with a move
-        (return None if the game state is invalid)"""
-        # Temporary move the piece
-        old_pos_notation = self.board[old_pos[0]][old_pos[1]]
-        new_pos_notation = self.board[new_pos[0]][new_pos[1]]
-
-        self.board[old_pos[0]][old_pos[1]] = "NN"
-        self.board[new_pos[0]][new_pos[1]] = old_pos_notation
-
-        # Get the opponent team
-        opponent = self._get_the_opponent_team()
-
-        # Check if the game state is valid
-        def _return_to_old_state():
-            self.board[old_pos[0]][old_pos[1]] = old_pos_notation
-            self.board[new_pos[0]][new_pos[1]] = new_pos_notation
-
-        # .Check for perpetual moves
-        hash_code = self.hash_board(self.board)
-        if self.move_history.get(hash_code, 0) + 1 == self.MAX_PERPETUAL:
-            _return_to_old_state()
-            return None
-
-        # .If the check is not passed, then return None
-        if General.is_general_exposed(self.board, self._current_team, opponent) is True:
-            _return_to_old_state()
-            return None
-
-        # Create a copy of the moved board and return the board to the old state
-        new_board = list(map(list, self.board))
-        new_move_history = dict(self.move_history)
-        new_move_history[hash_code] = new_move_history.get(hash_code, 0) + 1
-        _return_to_old_state()
-
-        # Calculate the number of pieces of the gamestate
-        new_number_of_red_pieces = self.number_of_red_pieces
-        new_number_of_black_pieces = self.number_of_black_pieces
-        if self.board[new_pos[0]][new_pos[1]] != "NN":
-            if self._current_team is Team.RED:
-                new_number_of_black_pieces -= 1
-            else:
-                new_number_of_red_pieces -= 1
-
-        return GameState(
-            new_board,
-            opponent,
-            new_move_history,
-            self._value_pack,
-            new_number_of_red_pieces,
-            new_number_of_black_pieces,
-        ), (old_pos, new_pos)
-
-    def generate_random_game_state(self):
-        """This method generates another gamestate that can be tranformed
-        by the current method using each move of the piece"""
-        # Put all positions of the current team's pieces into a list and shuffle it
-        team_positions = list()
-        for i in range(self.BOARD_SIZE_X):
-            for j in range(self.BOARD_SIZE_Y):
-                notation = self.board[i][j]
-
-                if Team[notation[0]] is self._current_team:
-                    team_positions.append((i, j))
-
-        shuffle(team_positions)
-
-        # Iterate through every pieces in the list, generate the piece's move list and shuffle it
-        for pos in team_positions:
-            notation = self.board[pos[0]][pos[1]]
-            moves_list = Piece.create_instance(
-                pos,
-                notation,
-                self.board,
-                self.number_of_black_pieces + self.number_of_red_pieces,
-                self._get_number_of_team_pieces(Team[notation[0]]),
-            ).admissible_moves
-            shuffle(moves_list)
-
-            for new_pos in moves_list:
-                new_gamestate = self.generate_game_state_with_move(pos, new_pos)
-                if new_gamestate is not None:
-                    return new_gamestate
-
-        # If the gamestate is terminal then return None
-        return None
-
-    def generate_all_game_states(self) -> list:
-        """This method returns the list of all states that can be accessed
-        from the current state by a single move"""
-
-        # Create a list that keeps track of all game states that can be generated.
-        game_states_available = list()
-
-        # Iterate through all moves
-        for i in range(self.BOARD_SIZE_X):
-            for j in range(self.BOARD_SIZE_Y):
-                notation = self.board[i][j]
-
-                # If the position is empty, then skip
-                if notation == "NN":
-                    continue
-
-                # If the current team's piece is on that position,
-                # then create an instance and get its admissible moves list
-                if Team[notation[0]] is self._current_team:
-                    moves_list = Piece.create_instance(
-                        (i, j),
-                        notation,
-                        self.board,
-                        self.number_of_black_pieces + self.number_of_red_pieces,
-                        self._get_number_of_team_pieces(Team[notation[0]]),
-                    ).admissible_moves
-
-                    # Iterate all moves in the moves list
-                    for new_pos in moves_list:
-                        # Create a new game state with that move
-                        game_state = self.generate_game_state_with_move((i, j), new_pos)
-
-                        # If the new game state is valid then add it to the list at the beginning
-                        if game_state is not None:
-                            game_states_available.append(game_state)
-
-        return game_states_available
-
-    def get_team_win(self):
-        """This method returns the winning team"""
-
-        # If the current game state has child game states, then return Team.NONE
-        for i in range(self.BOARD_SIZE_X):
-            for j in range(self.BOARD_SIZE_Y):
-                notation = self.board[i][j]
-                if notation == "NN":
-                    continue
-
-                if Team[notation[0]] is self._current_team:
-                    moves_list = Piece.create_instance(
-                        (i, j),
-                        notation,
-                        self.board,
-                        self.number_of_black_pieces + self.number_of_red_pieces,
-                        self._get_number_of_team_pieces(Team[notation[0]]),
-                    ).admissible_moves
-
-                    old_pos = (i, j)
-                    for new_pos in moves_list:
-                        old_pos_notation = self.board[old_pos[0]][old_pos[1]]
-                        new_pos_notation = self.board[new_pos[0]][new_pos[1]]
-
-                        self.board[old_pos[0]][old_pos[1]] = "NN"
-                        self.board[new_pos[0]][new_pos[1]] = old_pos_notation
-
-                        if (
-                            General.is_general_exposed(
-                                self.board,
-                                self._current_team,
-                                self._get_the_opponent_team(),
-                            )
-                            is False
-                        ):
-                            self.board[old_pos[0]][old_pos[1]] = old_pos_notation
-                            self.board[new_pos[0]][new_pos[1]] = new_pos_notation
-                            return Team.NONE
-
-                        self.board[old_pos[0]][old_pos[1]] = old_pos_notation
-                        self.board[new_pos[0]][new_pos[1]] = new_pos_notation
-
-        # Return the opponent's team if the current team has no admissible moves
-        return self._get_the_opponent_team()
-
-    # Static method
-    @staticmethod
-    def hash_board(board):
-        """This method returns the hash code of a board"""
-        return hash(tuple(map(tuple, board)))
-
-    # Class method
-    @classmethod
-    def generate_initial_game_state(cls, value_pack: int = 0):
-        """This method creates the initial board"""
-        initial_board = list(
-            [
-                ["BR", "BH", "BE", "BA", "BG", "BA", "BE", "BH", "BR"],
-                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
-                ["NN", "BC", "NN", "NN", "NN", "NN", "NN", "BC", "NN"],
-                ["BP", "NN", "BP", "NN", "BP", "NN", "BP", "NN", "BP"],
-                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
-                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
-                ["RP", "NN", "RP", "NN", "RP", "NN", "RP", "NN", "RP"],
-                ["NN", "RC", "NN", "NN", "NN", "NN", "NN", "RC", "NN"],
-                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
-                ["RR", "RH", "RE", "RA", "RG", "RA", "RE", "RH", "RR"],
-            ]
-        )
-        initial_move_history = dict()
-        hash_code = GameState.hash_board(initial_board)
-        initial_move_history[hash_code] = 1
-        return GameState(initial_board, Team.RED, initial_move_history, value_pack)
-
-    # [END METHOD]
+# Made by: Veil
+"""Module providing the property of game state"""
+from cmath import inf
+from bisect import insort
+from random import shuffle
+import piece_rules
+import evaluation
+from eval_cache import EVALUATION_CACHE
+from team import Team
+import board_encoding
+import zobrist
+from board_encoding import EMPTY, RED, BLACK, GENERAL, PAWN, TYPE_MASK, COLOUR_MASK, ROW_STRIDE
+from repetition import RepetitionStack
+from bitboard import Bitboards
+from legal_moves import LegalMoveFilter
+from position_status import PositionStatus
+
+
+class GameState:
+    """This class respresents the state of game containing
+    information and transforming method"""
+
+    # [BEGIN CONSTANTS]
+    # Board size
+    BOARD_SIZE_X = 10
+    BOARD_SIZE_Y = 9
+    # Limit for repeated moves
+    MAX_PERPETUAL = 3
+    # Move generator backends
+    MAILBOX_BACKEND = "mailbox"
+    BITBOARD_BACKEND = "bitboard"
+    # Backend of the game states created without bitboards
+    BACKEND = MAILBOX_BACKEND
+
+    # [BEGIN INITILIZATION]
+    def __init__(
+        self,
+        board: list,
+        current_team: Team,
+        repetition_stack: RepetitionStack = None,
+        value_pack: int = 0,
+        number_of_red_pieces: int = 16,
+        number_of_black_pieces: int = 16,
+        zobrist_key: int = None,
+        bitboards: Bitboards = None,
+        piece_squares: dict = None,
+        general_squares: dict = None,
+        value_terms: tuple = None,
+    ) -> None:
+        # The board is an integer-coded padded mailbox (see board_encoding.py)
+        self.board = board
+        self.number_of_red_pieces = number_of_red_pieces
+        self.number_of_black_pieces = number_of_black_pieces
+
+        self._value_pack = value_pack
+        self._value = None
+        self._current_team = current_team
+        self._all_child_gamestates = None
+        self._status = None
+
+        # 64-bit Zobrist key of the position (pieces and side to move),
+        # kept up to date by make_move and unmake_move
+        if zobrist_key is None:
+            zobrist_key = zobrist.compute_key(board, current_team)
+        self.zobrist_key = zobrist_key
+
+        # Stack of the keys of the positions played so far (the top is this position),
+        # shared with the parent game state and used for the perpetual check
+        if repetition_stack is None:
+            repetition_stack = RepetitionStack(zobrist_key)
+        self.repetition_stack = repetition_stack
+
+        # Bitboards of the position when the bitboard backend is used (see bitboard.py),
+        # kept up to date by make_move and unmake_move
+        if bitboards is None and self.BACKEND == self.BITBOARD_BACKEND:
+            bitboards = Bitboards.from_board(board)
+        self.bitboards = bitboards
+
+        # Sorted squares of the pieces of every team and square of every general
+        # (keyed by colour), kept up to date by make_move and unmake_move
+        if piece_squares is None:
+            piece_squares, general_squares = self._find_pieces(board)
+        self.piece_squares = piece_squares
+        self.general_squares = general_squares
+
+        # Static value terms of the pieces (see evaluation.py), computed at the first
+        # evaluation and then kept up to date by make_move and unmake_move
+        self._value_terms = value_terms
+
+    # Properties initialization
+    # .value
+    @property
+    def value(self) -> float:
+        """This is the Getter function of the value property,
+        return the value of the game state using chess pieces value"""
+
+        if self._value is None:
+            # The value only depends on the position, so it is shared through the process-wide cache
+            self._value = EVALUATION_CACHE.get(self.zobrist_key, self._value_pack)
+            if self._value is None:
+                self._value = self._get_game_state_value()
+                EVALUATION_CACHE.put(self.zobrist_key, self._value_pack, self._value)
+
+        return self._value
+
+    # .all_child_gamestates
+    @property
+    def all_child_gamestates(self) -> list:
+        """This is the Getter function of the list of child game states"""
+
+        if self._all_child_gamestates is None:
+            self._all_child_gamestates = self.generate_all_game_states()
+
+        return self._all_child_gamestates
+
+    # .status
+    @property
+    def status(self) -> PositionStatus:
+        """This is the Getter function of the status of the position
+        (legal moves, check, winner and mobility), computed once"""
+
+        if self._status is None:
+            self._status = self._get_status()
+
+        return self._status
+
+    # [END INITILIZATION]
+
+    # [BEGIN METHOD]
+    # Instance method
+    def _get_game_state_value(self) -> float:
+        """Return the evaluation value of the board"""
+        # Return the value of a game state when a team wins
+        winner = self.status.winner
+        if winner is Team.RED:
+            return inf
+
+        if winner is Team.BLACK:
+            return -inf
+
+        # The static terms are updated on every move, only the dynamic changes are computed
+        if self._value_terms is None:
+            self._value_terms = evaluation.get_value_terms(self.board, self.piece_squares, self._value_pack)
+        current_value = evaluation.get_static_value(
+            self._value_terms, self.number_of_red_pieces, self.number_of_black_pieces
+        )
+
+        # The mobility of the pieces of the team to move is known from the status
+        current_value += evaluation.get_dynamic_value(
+            self.board, self.piece_squares, self._value_pack, self.status.mobility
+        )
+
+        return current_value
+
+    def _get_the_opponent_team(self) -> Team:
+        """This method returns the opponent's team in the game state"""
+        if self._current_team is Team.BLACK:
+            return Team.RED
+        else:
+            return Team.BLACK
+
+    def generate_game_state_with_move(self, old_pos: tuple, new_pos: tuple):
+        """This method creates a game state with a move
+        (return None if the game state is invalid)"""
+        return self._generate_game_state_with_squares(
+            board_encoding.to_square(old_pos), board_encoding.to_square(new_pos)
+        )
+
+    def generate_game_state_with_null_move(self):
+        """This method creates a copy of the game state in which the current team
+        passes its turn (used by the null-move pruning of the minimax searches)"""
+        undo = self.make_null_move()
+        new_game_state = self.copy()
+        self.unmake_null_move(undo)
+
+        return new_game_state
+
+    def make_null_move(self) -> tuple:
+        """This method passes the turn in place and returns the undo record
+        used by unmake_null_move"""
+        undo = (
+            self.zobrist_key,
+            self.repetition_stack,
+            self._value,
+            self._all_child_gamestates,
+            self._status,
+        )
+        self.zobrist_key ^= zobrist.SIDE_KEY
+        # A null move is not a real move, so the positions before it are not repeated
+        self.repetition_stack = self.repetition_stack.push(self.zobrist_key, True)
+
+        self._current_team = self._get_the_opponent_team()
+        self._value = None
+        self._all_child_gamestates = None
+        self._status = None
+
+        return undo
+
+    def unmake_null_move(self, undo: tuple) -> None:
+        """This method restores the game state exactly as it was before make_null_move"""
+        (
+            self.zobrist_key,
+            self.repetition_stack,
+            self._value,
+            self._all_child_gamestates,
+            self._status,
+        ) = undo
+        self._current_team = self._get_the_opponent_team()
+
+    def _generate_game_state_with_squares(
+        self, old_square: int, new_square: int, is_valid: bool = False
+    ):
+        """This method creates a game state with a move between two mailbox squares
+        (return None if the game state is invalid). The move is not checked
+        if it is already known to be valid"""
+        # Make the move on the current game state
+        undo = self.make_move((old_square, new_square))
+
+        # If the move is invalid, then return None
+        if is_valid is False and self._is_last_move_invalid() is True:
+            self.unmake_move(undo)
+            return None
+
+        # Create a copy of the moved game state and return to the old state
+        new_game_state = self.copy()
+        self.unmake_move(undo)
+
+        return new_game_state, (
+            board_encoding.SQUARE_TO_POSITION[old_square],
+            board_encoding.SQUARE_TO_POSITION[new_square],
+        )
+
+    def make_move(self, move: tuple) -> tuple:
+        """This method makes a move (a pair of mailbox squares) in place
+        and returns the undo record used by unmake_move"""
+        old_square, new_square = move
+        moved_code = self.board[old_square]
+        captured_code = self.board[new_square]
+
+        # Move the piece
+        self.board[old_square] = EMPTY
+        self.board[new_square] = moved_code
+
+        if self.bitboards is not None:
+            self.bitboards.apply_move(old_square, new_square, moved_code, captured_code)
+
+        # Update the piece lists
+        colour = moved_code & COLOUR_MASK
+        team_squares = self.piece_squares[colour]
+        team_squares.remove(old_square)
+        insort(team_squares, new_square)
+        if moved_code & TYPE_MASK == GENERAL:
+            self.general_squares[colour] = new_square
+        if captured_code != EMPTY:
+            self.piece_squares[captured_code & COLOUR_MASK].remove(new_square)
+
+        # Update the number of pieces
+        if captured_code & RED:
+            self.number_of_red_pieces -= 1
+        elif captured_code & BLACK:
+            self.number_of_black_pieces -= 1
+
+        # Update the key and push the new position on the repetition stack
+        undo = (
+            old_square,
+            new_square,
+            moved_code,
+            captured_code,
+            self.zobrist_key,
+            self.repetition_stack,
+            self._value,
+            self._all_child_gamestates,
+            self._status,
+            self._value_terms,
+        )
+        if self._value_terms is not None:
+            self._value_terms = evaluation.update_value_terms(
+                self._value_terms, self._value_pack, moved_code, captured_code, old_square, new_square
+            )
+        self.zobrist_key ^= zobrist.get_move_key_delta(
+            moved_code, captured_code, old_square, new_square
+        )
+        is_irreversible = self._is_irreversible(moved_code, captured_code, old_square, new_square)
+        self.repetition_stack = self.repetition_stack.push(self.zobrist_key, is_irreversible)
+
+        # Pass the turn and clear the cached properties of the old position
+        self._current_team = self._get_the_opponent_team()
+        self._value = None
+        self._all_child_gamestates = None
+        self._status = None
+
+        return undo
+
+    def unmake_move(self, undo: tuple) -> None:
+        """This method restores the game state exactly as it was before make_move"""
+        (
+            old_square,
+            new_square,
+            moved_code,
+            captured_code,
+            self.zobrist_key,
+            self.repetition_stack,
+            self._value,
+            self._all_child_gamestates,
+            self._status,
+            self._value_terms,
+        ) = undo
+
+        # Take back the turn
+        self._current_team = self._get_the_opponent_team()
+
+        # Restore the number of pieces
+        if captured_code & RED:
+            self.number_of_red_pieces += 1
+        elif captured_code & BLACK:
+            self.number_of_black_pieces += 1
+
+        # Restore the piece lists
+        colour = moved_code & COLOUR_MASK
+        team_squares = self.piece_squares[colour]
+        team_squares.remove(new_square)
+        insort(team_squares, old_square)
+        if moved_code & TYPE_MASK == GENERAL:
+            self.general_squares[colour] = old_square
+        if captured_code != EMPTY:
+            insort(self.piece_squares[captured_code & COLOUR_MASK], new_square)
+
+        # Move the piece back
+        self.board[old_square] = moved_code
+        self.board[new_square] = captured_code
+
+        if self.bitboards is not None:
+            self.bitboards.apply_move(old_square, new_square, moved_code, captured_code)
+
+    def _is_general_exposed(self, colour: int) -> bool:
+        """This method returns True if the general of a team (given by its colour) is exposed"""
+        if self.bitboards is not None:
+            return self.bitboards.is_general_exposed(colour)
+
+        return piece_rules.is_general_exposed(self.board, colour, self.general_squares[colour])
+
+    def _is_move_exposing(self, old_square: int, new_square: int) -> bool:
+        """This method returns True if a move of the current team exposes its general
+        (only the pieces are moved, and they are moved back before returning)"""
+        colour = self.board[old_square] & COLOUR_MASK
+        return self._is_general_exposed_after_move(old_square, new_square, colour)
+
+    def is_move_giving_check(self, move: tuple) -> bool:
+        """This method returns True if a move (a pair of mailbox squares) of the current team
+        exposes the general of the opponent, without making the move"""
+        old_square, new_square = move
+        colour = (self.board[old_square] & COLOUR_MASK) ^ COLOUR_MASK
+        return self._is_general_exposed_after_move(old_square, new_square, colour)
+
+    def _is_general_exposed_after_move(self, old_square: int, new_square: int, colour: int) -> bool:
+        """This method returns True if the general of a team (given by its colour) is exposed
+        after a move (only the pieces are moved, and they are moved back before returning)"""
+        moved_code = self.board[old_square]
+        captured_code = self.board[new_square]
+
+        is_general_moved = moved_code & TYPE_MASK == GENERAL
+
+        self.board[old_square] = EMPTY
+        self.board[new_square] = moved_code
+        if self.bitboards is not None:
+            self.bitboards.apply_move(old_square, new_square, moved_code, captured_code)
+        if is_general_moved:
+            self.general_squares[moved_code & COLOUR_MASK] = new_square
+
+        is_exposed = self._is_general_exposed(colour)
+
+        self.board[old_square] = moved_code
+        self.board[new_square] = captured_code
+        if self.bitboards is not None:
+            self.bitboards.apply_move(old_square, new_square, moved_code, captured_code)
+        if is_general_moved:
+            self.general_squares[moved_code & COLOUR_MASK] = old_square
+
+        return is_exposed
+
+    def _get_piece_moves(self, square: int) -> list:
+        """This method returns the admissible target squares of the piece on a square"""
+        if self.bitboards is not None:
+            return self.bitboards.generate_piece_moves(square, self.board[square])
+
+        return piece_rules.get_piece_moves(self.board, square)
+
+    def _get_status(self) -> PositionStatus:
+        """This method computes the status of the position with a single pass
+        over the admissible moves of the current team"""
+        colour = board_encoding.TEAM_TO_COLOUR[self._current_team]
+        general_square = self.general_squares[colour]
+        move_filter = LegalMoveFilter(self.board, colour, general_square)
+
+        mobility = dict()
+        legal_moves = list()
+        board = self.board
+        for old_square in tuple(self.piece_squares[colour]):
+            moves_list = self._get_piece_moves(old_square)
+            mobility[old_square] = len(moves_list)
+
+            if old_square == general_square:
+                # The general changes every line it is on, so its moves are made and checked
+                for new_square in moves_list:
+                    if self._is_move_exposing(old_square, new_square) is False:
+                        legal_moves.append((old_square, new_square))
+            else:
+                for new_square in moves_list:
+                    if move_filter.is_legal(board, old_square, new_square):
+                        legal_moves.append((old_square, new_square))
+
+        # No move can repeat a position 3 times without 4 reversible moves before it
+        if self.repetition_stack.reversible_count + 1 < 2 * (self.MAX_PERPETUAL - 1):
+            valid_moves = legal_moves
+        else:
+            valid_moves = [
+                move for move in legal_moves if self._is_move_perpetual(move[0], move[1]) is False
+            ]
+
+        return PositionStatus(
+            legal_moves,
+            valid_moves,
+            move_filter.is_in_check,
+            Team.NONE if legal_moves else self._get_the_opponent_team(),
+            mobility,
+        )
+
+    def _is_move_perpetual(self, old_square: int, new_square: int) -> bool:
+        """This method returns True if a move would repeat the position too many times
+        (the key of the new position is computed without making the move)"""
+        moved_code = self.board[old_square]
+        captured_code = self.board[new_square]
+        key = self.zobrist_key ^ zobrist.get_move_key_delta(
+            moved_code, captured_code, old_square, new_square
+        )
+        is_irreversible = self._is_irreversible(moved_code, captured_code, old_square, new_square)
+        return self.repetition_stack.count_after_push(key, is_irreversible) == self.MAX_PERPETUAL
+
+    def _is_last_move_perpetual(self) -> bool:
+        """This method returns True if the move that has just been made repeats
+        the position too many times"""
+        return self.repetition_stack.count() == self.MAX_PERPETUAL
+
+    def _is_last_move_invalid(self) -> bool:
+        """This method returns True if the move that has just been made is invalid
+        (a perpetual move or a move exposing the general of the moving team)"""
+        # .Check for perpetual moves
+        if self._is_last_move_perpetual():
+            return True
+
+        # .Check if the general of the moving team is exposed
+        return self._is_general_exposed(board_encoding.TEAM_TO_COLOUR[self._current_team] ^ COLOUR_MASK)
+
+    def copy(self):
+        """This method returns an independent copy of the game state,
+        which can be used as a mutable search position"""
+        return GameState(
+            list(self.board),
+            self._current_team,
+            self.repetition_stack,
+            self._value_pack,
+            self.number_of_red_pieces,
+            self.number_of_black_pieces,
+            self.zobrist_key,
+            None if self.bitboards is None else self.bitboards.copy(),
+            {RED: list(self.piece_squares[RED]), BLACK: list(self.piece_squares[BLACK])},
+            dict(self.general_squares),
+            self._value_terms,
+        )
+
+    def generate_random_move(self):
+        """This method returns a random valid move (a pair of mailbox squares)
+        of the current team, or None if there is no valid move"""
+        # Put all squares of the current team's pieces into a list and shuffle it
+        colour = board_encoding.TEAM_TO_COLOUR[self._current_team]
+        team_squares = list(self.piece_squares[colour])
+        shuffle(team_squares)
+
+        general_square = self.general_squares[colour]
+        move_filter = LegalMoveFilter(self.board, colour, general_square)
+
+        # Iterate through every pieces in the list, generate the piece's move list and shuffle it
+        for square in team_squares:
+            moves_list = self._get_piece_moves(square)
+            shuffle(moves_list)
+
+            for new_square in moves_list:
+                # Skip the moves exposing the general
+                if square == general_square:
+                    if self._is_move_exposing(square, new_square) is True:
+                        continue
+                elif move_filter.is_legal(self.board, square, new_square) is False:
+                    continue
+
+                # Skip the perpetual moves
+                if self._is_move_perpetual(square, new_square) is False:
+                    return square, new_square
+
+        # If the gamestate is terminal then return None
+        return None
+
+    def generate_random_game_state(self):
+        """This method generates another gamestate that can be tranformed
+        by the current method using each move of the piece"""
+        move = self.generate_random_move()
+
+        # If the gamestate is terminal then return None
+        if move is None:
+            return None
+
+        return self._generate_game_state_with_squares(move[0], move[1], True)
+
+    def generate_all_game_states(self) -> list:
+        """This method returns the list of all states that can be accessed
+        from the current state by a single move"""
+
+        # Create a list that keeps track of all game states that can be generated.
+        game_states_available = list()
+
+        # Iterate through all valid moves and create a new game state with each of them
+        for square, new_square in self.status.valid_moves:
+            game_states_available.append(
+                self._generate_game_state_with_squares(square, new_square, True)
+            )
+
+        return game_states_available
+
+    def get_team_win(self):
+        """This method returns the winning team"""
+
+        # Team.NONE if the current team has a legal move, the opponent's team otherwise
+        return self.status.winner
+
+    # Static method
+    @staticmethod
+    def _is_irreversible(moved_code: int, captured_code: int, old_square: int, new_square: int) -> bool:
+        """This method returns True if a move can never be undone
+        (a capture or a forward pawn move)"""
+        return captured_code != EMPTY or (
+            moved_code & TYPE_MASK == PAWN and abs(new_square - old_square) == ROW_STRIDE
+        )
+
+    @staticmethod
+    def _find_pieces(board: list) -> tuple:
+        """This method returns the sorted squares of the pieces of every team
+        and the square of every general, found by scanning the board"""
+        piece_squares = {RED: [], BLACK: []}
+        general_squares = {RED: None, BLACK: None}
+        for square in board_encoding.SQUARES:
+            code = board[square]
+            if code != EMPTY:
+                piece_squares[code & COLOUR_MASK].append(square)
+                if code & TYPE_MASK == GENERAL:
+                    general_squares[code & COLOUR_MASK] = square
+
+        return piece_squares, general_squares
+
+    @staticmethod
+    def hash_board(board, current_team: Team = Team.RED):
+        """This method returns the Zobrist key of a board computed from scratch"""
+        return zobrist.compute_key(board, current_team)
+
+    # Class method
+    @classmethod
+    def generate_initial_game_state(cls, value_pack: int = 0):
+        """This method creates the initial board"""
+        initial_board = board_encoding.from_notation_board(
+            [
+                ["BR", "BH", "BE", "BA", "BG", "BA", "BE", "BH", "BR"],
+                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
+                ["NN", "BC", "NN", "NN", "NN", "NN", "NN", "BC", "NN"],
+                ["BP", "NN", "BP", "NN", "BP", "NN", "BP", "NN", "BP"],
+                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
+                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
+                ["RP", "NN", "RP", "NN", "RP", "NN", "RP", "NN", "RP"],
+                ["NN", "RC", "NN", "NN", "NN", "NN", "NN", "RC", "NN"],
+                ["NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN", "NN"],
+                ["RR", "RH", "RE", "RA", "RG", "RA", "RE", "RH", "RR"],
+            ]
+        )
+        hash_code = GameState.hash_board(initial_board, Team.RED)
+        return GameState(
+            initial_board, Team.RED, RepetitionStack(hash_code), value_pack, zobrist_key=hash_code
+        )
+
+    @classmethod
+    def generate_game_state_from_fen(cls, fen: str, value_pack: int = 0):
+        """This method creates a game state from a FEN string (see board_encoding.py)"""
+        board, current_team = board_encoding.from_fen(fen)
+        piece_squares, general_squares = GameState._find_pieces(board)
+        return GameState(
+            board,
+            current_team,
+            None,
+            value_pack,
+            len(piece_squares[RED]),
+            len(piece_squares[BLACK]),
+            piece_squares=piece_squares,
+            general_squares=general_squares,
+        )
+
+    # [END METHOD]
@@ -4,8 +4,16 @@ from math import inf
 from abc import ABC, abstractmethod
 from time import time
 from game_state import GameState
+from board_encoding import to_square
 from node import NodeMinimax, NodeMCTS, NodeExcavationMinimax
 from team import Team
+from eval_cache import EVALUATION_CACHE
+from transposition_table import TranspositionTable, DEFAULT_MAX_MEGABYTES
+from search import (
+    SearchContext, SearchStopped, SELECTIVE_SEARCH_OPTIONS, DEFAULT_SELECTIVE_SEARCH, DEFAULT_DEPTH_FIRST
+)
+from quiescence import DEFAULT_MODE as DEFAULT_QUIESCENCE_MODE
+from node_budget import NodeBudget, DEFAULT_MAX_NODES, DEFAULT_MAX_MEGABYTES as DEFAULT_MAX_TREE_MEGABYTES
 
 
 class GameTree(ABC):
@@ -13,7 +21,9 @@ class GameTree(ABC):
 
     # [BEGIN CONSTANTS]
 
-    MAX_NODE = inf
+    # Caps of the number of nodes and of the memory of the tree (see node_budget.py)
+    MAX_NODE = DEFAULT_MAX_NODES
+    MAX_MEGABYTES = DEFAULT_MAX_TREE_MEGABYTES
 
     # [END CONSTANTS]
 
@@ -22,11 +32,12 @@ class GameTree(ABC):
     def __init__(self, team: Team, value_pack: int = 0) -> None:
         # This method generates the initial game tree
         self.team = team
-        self.current_node = self._create_node(
-            GameState.generate_initial_game_state(value_pack), None, None
+        # Node budget shared by the nodes of the tree
+        self.node_budget = NodeBudget(self.MAX_NODE, self.MAX_MEGABYTES)
+        self._set_current_node(
+            self._create_node(GameState.generate_initial_game_state(value_pack), None, None)
         )
         self._value_pack = value_pack
-        self.count = 0
 
     # [END INITIALIZATION]
 
@@ -36,34 +47,53 @@ class GameTree(ABC):
     def move_to_best_child(self) -> tuple:
         """This method moves the current node to its "best child" on the game tree"""
 
-        self.current_node = self.current_node.best_move()
-        self.current_node.parent = None
+        self._set_current_node(self.current_node.best_move())
 
         return self.current_node.parent_move
 
     def move_to_child_node_with_move(self, old_pos, new_pos):
         """This method moves the current node to its "destination" on the game tree"""
 
-        # Define a comparative game state
+        # Find the child by its move, with its subtree and its statistics
+        node = self.current_node.find_child((to_square(old_pos), to_square(new_pos)))
+        if node is not None:
+            self._set_current_node(node)
+            return
+
+        # Suitable child not found
         new_state, move = GameState.generate_game_state_with_move(
             self.current_node.game_state, old_pos, new_pos
         )
-
-        # Traverse states in the children list to find a suitable child
-        for node in self.current_node.list_of_children:
-            if new_state.board == node.game_state.board:
-                # Suitable child found
-                self.current_node = node
-                self.current_node.parent = None
-                return
-
-        # Suitable child not found
-        self.current_node = self._create_node(new_state, None, move)
+        self._set_current_node(self._create_node(new_state, None, move))
+
+    def release_nodes(self) -> int:
+        """This method releases the subtrees below the children of the current node,
+        the least useful first, until the tree is back under the release target
+        of its node budget, and returns the number of released nodes"""
+        if self.node_budget.count <= self.node_budget.release_target:
+            return 0
+
+        number_of_nodes = 0
+        for child in sorted(self.current_node.list_of_children, key=self._get_usefulness):
+            number_of_nodes += child.release_children()
+            if self.node_budget.count <= self.node_budget.release_target:
+                break
+        return number_of_nodes
 
     def is_lost(self) -> bool:
         """This method checks if the bot had lost or not"""
 
-        return len(self.current_node.game_state.all_child_gamestates) == 0
+        return len(self.current_node.game_state.status.valid_moves) == 0
+
+    # Private method
+    def _set_current_node(self, node) -> None:
+        """This method makes a node the root of the game tree, counts the nodes kept
+        below it and releases the least useful subtrees if there are too many"""
+        node.parent = None
+        node.budget = self.node_budget
+        self.current_node = node
+        self.node_budget.count = node.count_subtree()
+        self.release_nodes()
 
     # Abstract method
     @abstractmethod
@@ -71,6 +101,12 @@ class GameTree(ABC):
         """This method return a new node of the tree"""
         pass
 
+    @abstractmethod
+    def _get_usefulness(self, child) -> float:
+        """This method returns how useful the subtree of a child of the current node is
+        (the least useful subtrees are released first)"""
+        pass
+
     # [END METHODS]
 
 
@@ -82,6 +118,15 @@ class GameTreeMinimax(GameTree):
     def __init__(self, team, target_depth, value_pack: int = 0):
         super().__init__(team, value_pack)
         self.target_depth = target_depth
+        # Transposition table shared by the searches of the bot
+        self.transposition_table = TranspositionTable(DEFAULT_MAX_MEGABYTES)
+        # Quiescence search at the target depth: "off", "captures" or "checks"
+        self.quiescence = DEFAULT_QUIESCENCE_MODE
+        # Selective search options (see SELECTIVE_SEARCH_OPTIONS in search.py)
+        self.selective_search = set(DEFAULT_SELECTIVE_SEARCH)
+        # Depth-first mode: only the children of the root are kept as nodes,
+        # and the search below them makes and takes back the moves on a single position
+        self.depth_first = DEFAULT_DEPTH_FIRST
 
     # [END INITIALIZATION]
 
@@ -93,6 +138,36 @@ class GameTreeMinimax(GameTree):
 
         return NodeMinimax(game_state, parent, parent_move)
 
+    def _get_usefulness(self, child) -> float:
+        """This method returns the value of a child for the team to move at the current node
+        (the children without a value come first)"""
+        if child.minimax_value is None:
+            return -inf
+        return child.minimax_value * self.current_node.game_state._current_team.value
+
+    def _get_stopped_best_child(self) -> NodeMinimax:
+        """This method returns the best child found by a search of the current node
+        stopped by the node budget (the first child if none was searched)"""
+        best_child = self.current_node.best_child
+        if best_child is None:
+            self.current_node.generate_all_children()
+            best_child = self.current_node.list_of_children[0]
+        return best_child
+
+    def _create_search_context(self, deadline: float = None) -> SearchContext:
+        """This method creates the context of a search of the bot"""
+        return SearchContext(
+            self.transposition_table,
+            deadline,
+            quiescence=self.quiescence != "off",
+            quiescence_checks=self.quiescence == "checks",
+            null_move="null_move" in self.selective_search,
+            late_move_reductions="late_move_reductions" in self.selective_search,
+            futility="futility" in self.selective_search,
+            depth_first=self.depth_first,
+            node_budget=self.node_budget,
+        )
+
     # Instance method
 
     def process(self, moves_queue) -> tuple:
@@ -100,15 +175,65 @@ class GameTreeMinimax(GameTree):
         # [START BOT'S TURN]
         # Start the time counter
         start = time()
-        self.current_node.minimax(self.target_depth, self.team is Team.RED)
-        old_pos, new_pos = self.move_to_best_child()
+        self.transposition_table.new_search()
+        search_context = self._create_search_context()
+        try:
+            self.current_node.minimax(
+                self.target_depth, self.team is Team.RED, search_context=search_context
+            )
+            old_pos, new_pos = self.move_to_best_child()
+        except SearchStopped:
+            self._set_current_node(self._get_stopped_best_child())
+            old_pos, new_pos = self.current_node.parent_move
         moves_queue.append((old_pos, new_pos))
 
         # [POST PROCESS]
         print(self.current_node.minimax_value)
-        self.count = 0
+        print("Node budget: {}".format(self.node_budget))
         end = time()  # End the time counter
         print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
+        print("Transposition table: {}".format(self.transposition_table))
+        print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
+        return old_pos, new_pos
+
+        # [END BOT'S TURN]
+
+    # [END METHODS]
+
+
+class GameTreePVS(GameTreeMinimax):
+    """This class is responsible for performance of the Minimax game tree
+    searched with the negamax principal variation search"""
+
+    # [BEGIN METHODS]
+    # Instance method
+
+    def process(self, moves_queue) -> tuple:
+        """Let the bot run"""
+        # [START BOT'S TURN]
+        # Start the time counter
+        start = time()
+        self.transposition_table.new_search()
+        search_context = self._create_search_context()
+        try:
+            self.current_node.negamax(self.target_depth, search_context=search_context)
+            # The other children may only have bounds, so the best child is the one found by the search
+            self._set_current_node(self.current_node.best_child)
+            old_pos, new_pos = self.current_node.parent_move
+        except SearchStopped:
+            self._set_current_node(self._get_stopped_best_child())
+            old_pos, new_pos = self.current_node.parent_move
+        moves_queue.append((old_pos, new_pos))
+
+        # [POST PROCESS]
+        print(self.current_node.minimax_value)
+        print("Nodes:", search_context.nodes)
+        print("Node budget: {}".format(self.node_budget))
+        end = time()  # End the time counter
+        print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
+        print("Transposition table: {}".format(self.transposition_table))
         print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
         return old_pos, new_pos
 
@@ -148,6 +273,14 @@ class GameTreeMCTS(GameTree):
         root.num = 0
         starting_time = time()
         while time() - starting_time < self.time_allowed:
+            # Release the least useful subtrees when the tree exceeds its node budget,
+            # and stop if it still does
+            if self.node_budget.is_exceeded():
+                self.release_nodes()
+                if self.node_budget.is_exceeded():
+                    self.node_budget.stops += 1
+                    break
+
             root.num += 1
             leaf = self.traverse(root)
             leaf.generate_all_children()
@@ -164,10 +297,10 @@ class GameTreeMCTS(GameTree):
         moves_queue.append((old_pos, new_pos))
 
         # [POST PROCESS]
-        print(self.count)
-        self.count = 0
+        print("Node budget: {}".format(self.node_budget))
         end = time()  # End the time counter
         print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
         print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
         return old_pos, new_pos
 
@@ -176,6 +309,11 @@ class GameTreeMCTS(GameTree):
 
         return NodeMCTS(game_state, parent, parent_move)
 
+    def _get_usefulness(self, child) -> float:
+        """This method returns the number of visits of a child"""
+
+        return child.n
+
     # [END METHODS]
 
 
@@ -191,26 +329,35 @@ class GameTreeDynamicMinimax(GameTreeMinimax):
         ADVANTAGE_CONSTANT = 25
 
         start = time()  # Start the time counter
+        self.transposition_table.new_search()
+        search_context = self._create_search_context()
         print(self.current_node.game_state.value * self.team.value)
         # If the branching factor of the current node is <= 3, then run at target depth + 2
-        if len(self.current_node.game_state.all_child_gamestates) <= 3:
-            self.current_node.minimax(self.target_depth + 2, self.team is Team.RED)
+        if len(self.current_node.game_state.status.valid_moves) <= 3:
+            depth = self.target_depth + 2
         # If the advantage value of the current node is >= the advantage constant,
         # Then run at target depth + 1
         elif self.current_node.game_state.value * self.team.value >= ADVANTAGE_CONSTANT:
-            self.current_node.minimax(self.target_depth + 1, self.team is Team.RED)
+            depth = self.target_depth + 1
         # If the advantage value of the current node is smaller the advantage constant,
         # Then run at target depth
         else:
-            self.current_node.minimax(self.target_depth, self.team is Team.RED)
-        old_pos, new_pos = self.move_to_best_child()
+            depth = self.target_depth
+        # The deeper searches can exceed the node budget, then the best move so far is played
+        try:
+            self.current_node.minimax(depth, self.team is Team.RED, search_context=search_context)
+            old_pos, new_pos = self.move_to_best_child()
+        except SearchStopped:
+            self._set_current_node(self._get_stopped_best_child())
+            old_pos, new_pos = self.current_node.parent_move
         moves_queue.append((old_pos, new_pos))
 
         # [POST PROCESS]
-        print(self.count)
-        self.count = 0
+        print("Node budget: {}".format(self.node_budget))
         end = time()  # End the time counter
         print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
+        print("Transposition table: {}".format(self.transposition_table))
         print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
         return old_pos, new_pos
 
@@ -236,19 +383,29 @@ class GameTreeDeepeningMinimax(GameTreeMinimax):
             DEPTH_VALUE_CONSTANT = [0, 1, 1, 2, 4, 7]
 
         start = time()  # Start the time counter
+        self.transposition_table.new_search()
+        search_context = self._create_search_context()
         # Find the list of best moves
         best_moves = dict()
-        for depth in range(1, self.target_depth + 1):
-            if DEPTH_VALUE_CONSTANT[depth] == 0:
-                continue
-            self.current_node.minimax(depth, self.team is Team.RED)
-            for child in self.current_node.list_of_children:
-                if child.minimax_value == self.current_node.minimax_value:
-                    key = child.parent_move
-                    best_moves[key] = (
-                        best_moves.get(key, 0) + DEPTH_VALUE_CONSTANT[depth]
-                    )
-                    print(depth, key)
+        try:
+            for depth in range(1, self.target_depth + 1):
+                if DEPTH_VALUE_CONSTANT[depth] == 0:
+                    continue
+                self.current_node.minimax(
+                    depth, self.team is Team.RED, search_context=search_context
+                )
+                for child in self.current_node.list_of_children:
+                    if child.minimax_value == self.current_node.minimax_value:
+                        key = child.parent_move
+                        best_moves[key] = (
+                            best_moves.get(key, 0) + DEPTH_VALUE_CONSTANT[depth]
+                        )
+                        print(depth, key)
+        except SearchStopped:
+            # The depths completed before the node budget was exceeded vote,
+            # or the best move so far is played if none was completed
+            if not best_moves:
+                best_moves[self._get_stopped_best_child().parent_move] = 0
 
         # Find the best value
         old_pos, new_pos = None, None
@@ -263,10 +420,115 @@ class GameTreeDeepeningMinimax(GameTreeMinimax):
         moves_queue.append((old_pos, new_pos))
 
         # [POST PROCESS]
-        print(self.count)
-        self.count = 0
+        print("Node budget: {}".format(self.node_budget))
+        end = time()  # End the time counter
+        print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
+        print("Transposition table: {}".format(self.transposition_table))
+        print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
+        return old_pos, new_pos
+
+        # [END BOT'S TURN]
+
+    # [END METHODS]
+
+
+class GameTreeTimedMinimax(GameTreeMinimax):
+    """This class is responsible for performance of the time-controlled Minimax game tree:
+    the search deepens until the time allowed is spent"""
+
+    # [BEGIN CONSTANTS]
+
+    MAX_DEPTH = 32
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+
+    def __init__(self, team, time_allowed, value_pack: int = 0):
+        super().__init__(team, self.MAX_DEPTH, value_pack)
+        self.time_allowed = time_allowed
+        # Time spent from the start of the last search to the end of every completed depth
+        self.depth_times = []
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    # Private method
+
+    def _search_root(self, root: NodeMinimax, depth: int, previous_value: float, search_context) -> tuple:
+        """This method searches the root at a depth with the full window
+        and returns its value and its best child"""
+        value = root.minimax(depth, self.team is Team.RED, search_context=search_context)
+        # The best child is the first child with the value of the root (a later child
+        # with the same value may only have reached the bound of its window)
+        return value, root.best_child
+
+    def _get_unfinished_best_child(self, root: NodeMinimax) -> NodeMinimax:
+        """This method returns the best child of an unfinished iteration that can be played,
+        or None to play the best child of the previous iteration"""
+        # The previous best move is searched first, so the best child
+        # of the unfinished iteration is at least as good
+        return root.best_child
+
+    # Instance method
+
+    def iterative_deepening(self, root: NodeMinimax, deadline: float) -> tuple:
+        """This method searches at depth 1, 2, 3... until the deadline and returns
+        the best child, its value and the last completed depth"""
+        start = time()
+        search_context = self._create_search_context(deadline)
+        best_child, best_value, completed_depth = None, None, 0
+        self.depth_times = []
+
+        for depth in range(1, self.target_depth + 1):
+            # The root searches the best move of the previous iteration first
+            try:
+                value, child = self._search_root(root, depth, best_value, search_context)
+            except SearchStopped:
+                child = self._get_unfinished_best_child(root)
+                if child is not None:
+                    best_child = child
+                    best_value = child.minimax_value
+                break
+
+            best_child, best_value = child, value
+            completed_depth = depth
+            self.depth_times.append(time() - start)
+
+            # Stop deepening if the game is decided or the time is up
+            if abs(value) == inf or search_context.is_time_up():
+                break
+
+        # If not even one child could be searched, take the first one
+        if best_child is None:
+            root.generate_all_children()
+            best_child = root.list_of_children[0]
+
+        return best_child, best_value, completed_depth
+
+    def process(self, moves_queue) -> tuple:
+        """Let the bot run"""
+        # [START BOT'S TURN]
+        # Start the time counter
+        start = time()
+        self.transposition_table.new_search()
+        best_child, best_value, completed_depth = self.iterative_deepening(
+            self.current_node, start + self.time_allowed
+        )
+        self._set_current_node(best_child)
+        old_pos, new_pos = self.current_node.parent_move
+        moves_queue.append((old_pos, new_pos))
+
+        # [POST PROCESS]
+        print("Depth:", completed_depth)
+        print("Time to depth:", ", ".join("{:.2f} s".format(depth_time) for depth_time in self.depth_times))
+        print(best_value)
+        print("Node budget: {}".format(self.node_budget))
         end = time()  # End the time counter
         print("Time: {:.2f} s".format(end - start))
+        print("Evaluation cache: {}".format(EVALUATION_CACHE))
+        print("Transposition table: {}".format(self.transposition_table))
         print("{} moves: {} -> {}".format(self.team.name, old_pos, new_pos))
         return old_pos, new_pos
 
@@ -275,6 +537,119 @@ class GameTreeDeepeningMinimax(GameTreeMinimax):
     # [END METHODS]
 
 
+class GameTreeAspirationMinimax(GameTreeTimedMinimax):
+    """This class is responsible for performance of the time-controlled Minimax game tree
+    with aspiration windows: every depth is first searched with a narrow window around
+    the value of the previous depth, which is widened when the value falls outside"""
+
+    # [BEGIN CONSTANTS]
+
+    # Half width of the first window, multiplied by WIDENING_FACTOR on every failure
+    # (the window becomes infinite after MAX_WIDENINGS failures)
+    ASPIRATION_WINDOW = 10
+    WIDENING_FACTOR = 4
+    MAX_WIDENINGS = 3
+
+    # [END CONSTANTS]
+
+    # [BEGIN METHODS]
+    # Private method
+
+    def _search_root(self, root: NodeMinimax, depth: int, previous_value: float, search_context) -> tuple:
+        """This method searches the root at a depth with aspiration windows
+        and returns its value and its best child"""
+        max_turn = self.team is Team.RED
+        if previous_value is None or abs(previous_value) == inf:
+            value = root.minimax(depth, max_turn, search_context=search_context)
+            return value, root.best_child
+
+        # Widen the side of the window on which the value falls until it is inside
+        delta = self.ASPIRATION_WINDOW
+        alpha, beta = previous_value - delta, previous_value + delta
+        number_of_failures = 0
+        while True:
+            value = root.minimax(depth, max_turn, alpha, beta, search_context)
+            is_failed_low = value <= alpha and alpha > -inf
+            is_failed_high = value >= beta and beta < inf
+            if not is_failed_low and not is_failed_high:
+                return value, root.best_child
+
+            number_of_failures += 1
+            if number_of_failures >= self.MAX_WIDENINGS:
+                delta = inf
+            else:
+                delta *= self.WIDENING_FACTOR
+            if is_failed_low:
+                alpha = previous_value - delta
+            else:
+                beta = previous_value + delta
+
+    def _get_unfinished_best_child(self, root: NodeMinimax) -> NodeMinimax:
+        """This method returns None: a window that failed may not have found the best child"""
+        return None
+
+    # [END METHODS]
+
+
+class GameTreeMTDF(GameTreeTimedMinimax):
+    """This class is responsible for performance of the time-controlled Minimax game tree
+    with MTD(f): every depth is searched by null-window probes, starting from the value
+    of the previous depth, which move a lower and an upper bound until they meet.
+    The probes search the same positions again, so they rely on the transposition table"""
+
+    # [BEGIN METHODS]
+    # Private method
+
+    def _search_root(self, root: NodeMinimax, depth: int, previous_value: float, search_context) -> tuple:
+        """This method searches the root at a depth with MTD(f)
+        and returns its value and its best child"""
+        max_turn = self.team is Team.RED
+        value = previous_value
+        if value is None or abs(value) == inf:
+            value = root.game_state.value
+        lower_bound, upper_bound = -inf, inf
+        best_child = None
+
+        while lower_bound < upper_bound:
+            # Probe whether the value is at least beta
+            if value == lower_bound:
+                beta = value + NodeMinimax.NULL_WINDOW
+            else:
+                beta = value
+            value = root.minimax(depth, max_turn, beta - NodeMinimax.NULL_WINDOW, beta, search_context)
+            if value < beta:
+                upper_bound = value
+            else:
+                lower_bound = value
+
+            # The best child is known from the probes in which the team of the bot
+            # proves its bound (a failing probe only bounds every child)
+            if (value >= beta) == max_turn or best_child is None:
+                best_child = root.best_child
+
+        return value, best_child
+
+    def _get_unfinished_best_child(self, root: NodeMinimax) -> NodeMinimax:
+        """This method returns None: an unfinished probe may not have found the best child"""
+        return None
+
+    # [END METHODS]
+
+
+class GameTreeSelectiveMinimax(GameTreeTimedMinimax):
+    """This class is responsible for performance of the time-controlled Minimax game tree
+    with every selective search option: null-move pruning, late move reductions,
+    and futility pruning and razoring"""
+
+    # [BEGIN INITIALIZATION]
+
+    def __init__(self, team, time_allowed, value_pack: int = 0):
+        super().__init__(team, time_allowed, value_pack)
+        self.selective_search = set(SELECTIVE_SEARCH_OPTIONS)
+
+    # [END INITIALIZATION]
+
+
 class GameTreeExcavationMinimax(GameTreeMinimax):
     """This class is responsible for performance of the Excavation Minimax game tree"""
 
@@ -283,6 +658,8 @@ class GameTreeExcavationMinimax(GameTreeMinimax):
     def __init__(self, team, value_pack: int = 2, rollout_policy="RANDOM"):
         super().__init__(team, value_pack)
         self.rollout_policy = rollout_policy
+        # The excavation of the leaves needs the nodes
+        self.depth_first = False
 
     # [END INITIALIZATION]
 
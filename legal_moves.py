@@ -0,0 +1,122 @@
+"""Module providing the pin- and check-aware legality test of the moves"""
+from board_encoding import (
+    EMPTY, OFFBOARD, COLOUR_MASK, ROW_STRIDE, RED, GENERAL, HORSE, ROOK, CANNON, PAWN,
+)
+from move_tables import ORTHOGONAL_OFFSETS, HORSE_ATTACKS
+
+
+class LegalMoveFilter:
+    """This class holds every threat against the general of a team: the checkers,
+    the pieces pinned on a line or on the leg of a horse, and the cannons that
+    a new screen or a missing screen would turn into checkers. It tells whether a
+    move of a piece other than the general is legal without making the move"""
+
+    __slots__ = ("line_threats", "horse_threats", "pawn_checkers", "threatened_squares", "is_in_check")
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self, board: list, colour: int, general_square: int) -> None:
+        enemy = colour ^ COLOUR_MASK
+        enemy_rook = enemy | ROOK
+        enemy_cannon = enemy | CANNON
+        enemy_horse = enemy | HORSE
+        enemy_pawn = enemy | PAWN
+        # The generals can only face each other on the file towards the opponent
+        forward = -ROW_STRIDE if colour == RED else ROW_STRIDE
+
+        # (attacker square, pieces in between, pieces needed in between to attack,
+        # squares in between) of every rook, general and cannon on a line of the general
+        self.line_threats = []
+        # (leg square, horse square) of every horse attacking the general's square
+        self.horse_threats = []
+        # Squares of the pawns giving check
+        self.pawn_checkers = []
+        # Squares that a move must leave or reach to change the threats
+        self.threatened_squares = set()
+        self.is_in_check = False
+
+        # .Scan the lines: only the first 3 pieces of a line can become checkers
+        # (a move adds or removes at most one piece in between)
+        for offset in ORTHOGONAL_OFFSETS:
+            between = []
+            pieces_between = 0
+            square = general_square + offset
+            while board[square] != OFFBOARD:
+                code = board[square]
+                if code != EMPTY:
+                    needed = None
+                    if code == enemy_rook or (code == enemy | GENERAL and offset == forward):
+                        needed = 0
+                    elif code == enemy_cannon:
+                        needed = 1
+
+                    # The attacker is a checker, or one move can make it a checker
+                    if needed is not None and abs(pieces_between - needed) <= 1:
+                        self.line_threats.append((square, pieces_between, needed, frozenset(between)))
+                        self.threatened_squares.update(between)
+                        if pieces_between == needed:
+                            self.is_in_check = True
+
+                    if pieces_between == 2:
+                        break
+                    pieces_between += 1
+
+                between.append(square)
+                square += offset
+
+        # .Horses: a free leg is a check, an occupied leg is pinned
+        for horse_square, leg_square in HORSE_ATTACKS[general_square]:
+            if board[horse_square] == enemy_horse:
+                self.horse_threats.append((leg_square, horse_square))
+                self.threatened_squares.add(leg_square)
+                if board[leg_square] == EMPTY:
+                    self.is_in_check = True
+
+        # .Pawns: they can only be captured
+        for square in (general_square + 1, general_square - 1, general_square + forward):
+            if board[square] == enemy_pawn:
+                self.pawn_checkers.append(square)
+                self.is_in_check = True
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def is_legal(self, board: list, old_square: int, new_square: int) -> bool:
+        """This method returns True if a move of a piece other than the general
+        does not expose the general (the board is the one before the move)"""
+        # Fast path: the move cannot change any threat
+        if (
+            not self.is_in_check
+            and old_square not in self.threatened_squares
+            and new_square not in self.threatened_squares
+        ):
+            return True
+
+        # .Pawn checks can only be answered by a capture
+        for pawn_square in self.pawn_checkers:
+            if new_square != pawn_square:
+                return False
+
+        # .Horses: the leg must stay blocked (or be blocked), unless the horse is captured
+        for leg_square, horse_square in self.horse_threats:
+            if new_square == horse_square:
+                continue
+            if board[leg_square] == EMPTY:
+                if new_square != leg_square:
+                    return False
+            elif old_square == leg_square:
+                return False
+
+        # .Lines: count the pieces in between after the move
+        for attacker_square, pieces_between, needed, between in self.line_threats:
+            if new_square == attacker_square:
+                continue
+            if old_square in between:
+                pieces_between -= 1
+            if new_square in between and board[new_square] == EMPTY:
+                pieces_between += 1
+            if pieces_between == needed:
+                return False
+
+        return True
+
+    # [END METHODS]
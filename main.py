@@ -7,9 +7,10 @@ import sys
 import gc
 from gui_utilities import Button, DropDown, InputBox
 from game_state import GameState
-from game_tree import GameTree, GameTreeMinimax, GameTreeMCTS, GameTreeDynamicMinimax, GameTreeDeepeningMinimax, GameTreeExcavationMinimax
+from game_tree import GameTree, GameTreeMinimax, GameTreeMCTS, GameTreeDynamicMinimax, GameTreeDeepeningMinimax, GameTreeExcavationMinimax, GameTreeTimedMinimax, GameTreePVS, GameTreeSelectiveMinimax, GameTreeAspirationMinimax, GameTreeMTDF
 from team import Team
 from piece import Piece
+import board_encoding
 import os
 
 # [BEGIN INITIALIZING CONSTANT]
@@ -45,6 +46,8 @@ def str_to_type(type_str: str) -> GameTree:
     """This function returns the type of GameTree corresponding to the input string"""
     if type_str == 'Minimax':
         return GameTreeMinimax
+    elif type_str == 'PVS':
+        return GameTreePVS
     elif type_str == 'MCTS':
         return GameTreeMCTS
     elif type_str == 'DyMinimax':
@@ -53,6 +56,14 @@ def str_to_type(type_str: str) -> GameTree:
         return GameTreeDeepeningMinimax
     elif type_str == 'ExMinimax':
         return GameTreeExcavationMinimax
+    elif type_str == 'TiMinimax':
+        return GameTreeTimedMinimax
+    elif type_str == 'SeMinimax':
+        return GameTreeSelectiveMinimax
+    elif type_str == 'AsMinimax':
+        return GameTreeAspirationMinimax
+    elif type_str == 'MTDf':
+        return GameTreeMTDF
 
 
 def draw_gamestate(game_state: GameState, inverse: bool = False) -> None:
@@ -65,16 +76,16 @@ def draw_gamestate(game_state: GameState, inverse: bool = False) -> None:
     # Draw pieces
     for x in range(GameState.BOARD_SIZE_X):
         for y in range(GameState.BOARD_SIZE_Y):
-            notation = game_state.board[x][y]
+            code = game_state.board[board_encoding.to_square((x, y))]
 
             # Skip if there is no piece in the position
-            if notation == "NN":
+            if code == board_encoding.EMPTY:
                 continue
 
-            # Create an instance of the piece using notation
+            # Create an instance of the piece using its code
             piece = Piece.create_instance(
                 (abs(x - int(inverse) * 9), y),
-                notation, game_state.board, None, None
+                code, game_state.board, None, None
             )
 
             # Get the piece sprite and draw it
@@ -186,19 +197,22 @@ def pve_screen(
                             position_chosen, piece_chosen = None, None
                             continue
 
-                        notation = player_gamestate.board[board_pos[0]][board_pos[1]]
+                        code = player_gamestate.board[board_encoding.to_square(board_pos)]
                         # If the piece belongs to the player, choose the piece
-                        if Team[notation[0]] is player_team:
+                        if board_encoding.get_team(code) is player_team:
                             position_chosen = click_pos
                             piece_chosen = Piece.create_instance(
                                 board_pos, 
-                                notation, 
+                                code, 
                                 player_gamestate.board, 
                                 None, None
                             )
 
                         # If the click position is in the list of admissible moves of the chosen piece
-                        elif piece_chosen is not None and board_pos in piece_chosen.admissible_moves:
+                        elif (
+                            piece_chosen is not None
+                            and board_encoding.to_square(board_pos) in piece_chosen.admissible_moves
+                        ):
                             new_gamestate = player_gamestate.generate_game_state_with_move(piece_chosen.position, board_pos)
                             # If the move is valid, then move to the position
                             if new_gamestate is not None:
@@ -253,7 +267,7 @@ def pve_menu() -> None:
         ["#404040", "#606060"],
         20, 270, 100, 30,
         pygame.font.SysFont(None, 25),
-        "Type", ["Minimax", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax"])
+        "Type", ["Minimax", "PVS", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax", "TiMinimax", "SeMinimax", "AsMinimax", "MTDf"])
 
     bot_value = DropDown(
         ["#000000", "#202020"],
@@ -556,12 +570,13 @@ def simulation_screen(
 
         if (
             bot_type == 'Minimax'
+            or bot_type == 'PVS'
             or bot_type == 'DyMinimax'
             or bot_type == 'DeMinimax'
             or bot_type == 'ExMinimax'
         ):
             res += 'Depth ' + bot_property + ' '
-        elif bot_type == 'MCTS':
+        elif bot_type in ('MCTS', 'TiMinimax', 'SeMinimax', 'AsMinimax', 'MTDf'):
             res += 'Time allowed ' + bot_property + 's '
 
         res += 'Value ' + bot_value
@@ -718,16 +733,16 @@ def simulation_screen(
         # .Piece status
         piece_position = resources.get_piece_position(mouse_pos)
         if piece_position is not None:
-            notation = gamestate.board[piece_position[0]][piece_position[1]]
+            code = gamestate.board[board_encoding.to_square(piece_position)]
             # If the mouse in on a piece, then draw that piece status
-            if notation != "NN":
-                if Team[notation[0]] is Team.RED:
+            if code != board_encoding.EMPTY:
+                if board_encoding.get_team(code) is Team.RED:
                     number_of_team_piece = gamestate.number_of_red_pieces
                 else:
                     number_of_team_piece = gamestate.number_of_black_pieces
 
                 piece = Piece.create_instance(
-                    piece_position, notation, gamestate.board,
+                    piece_position, code, gamestate.board,
                     gamestate.number_of_black_pieces + gamestate.number_of_red_pieces,
                     number_of_team_piece
                 )
@@ -770,7 +785,7 @@ def eve_menu():
         ["#404040", "#606060"],
         20, 290, 100, 30,
         pygame.font.SysFont(None, 25),
-        "Type", ["Minimax", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax"])
+        "Type", ["Minimax", "PVS", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax", "TiMinimax", "SeMinimax", "AsMinimax", "MTDf"])
 
     black_value = DropDown(
         ["#000000", "#202020"],
@@ -784,7 +799,7 @@ def eve_menu():
         ["#F07470", "#F1959B"],
         350, 290, 100, 30,
         pygame.font.SysFont(None, 25),
-        "Type", ["Minimax", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax"])
+        "Type", ["Minimax", "PVS", "MCTS", "DyMinimax", "DeMinimax", "ExMinimax", "TiMinimax", "SeMinimax", "AsMinimax", "MTDf"])
 
     red_value = DropDown(
         ["#DC1C13", "#EA4C46"],
@@ -0,0 +1,78 @@
+"""Module providing the move ordering of the minimax searches, which sorts the
+moves of a position without making or evaluating them"""
+from board_encoding import EMPTY, TYPE_MASK, MAILBOX_SIZE
+from piece_rules import PIECE_VALUES
+
+
+# [BEGIN FUNCTIONS]
+def get_mvv_lva_key(board: list, move: tuple) -> tuple:
+    """This function returns the sort key of a capture by the most valuable victim
+    and then the least valuable attacker"""
+    return (-PIECE_VALUES[board[move[1]] & TYPE_MASK], PIECE_VALUES[board[move[0]] & TYPE_MASK])
+
+
+# [END FUNCTIONS]
+
+
+class MoveOrdering:
+    """This class holds the killer moves of every ply and the history table of a search.
+    The moves are searched in the order: the hash move (of the transposition table or of
+    the previous search), the captures by MVV-LVA, the killer moves and the quiet moves
+    by their history score"""
+
+    # [BEGIN CONSTANTS]
+    # Number of killer moves kept for every ply
+    NUMBER_OF_KILLERS = 2
+
+    # Categories of the moves, in search order
+    HASH_MOVE = 0
+    CAPTURE = 1
+    KILLER = 2
+    QUIET = 3
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self) -> None:
+        # Killer moves (pairs of squares) of every ply, the most recent first
+        self.killers = []
+        # History score of every move, indexed by old square * MAILBOX_SIZE + new square
+        self.history = [0] * (MAILBOX_SIZE * MAILBOX_SIZE)
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def get_move_key(self, board: list, move: tuple, ply: int, hash_move: tuple = None) -> tuple:
+        """This method returns the sort key of a move (a pair of squares) in a position"""
+        if move == hash_move:
+            return (self.HASH_MOVE, 0, 0)
+        if board[move[1]] != EMPTY:
+            return (self.CAPTURE,) + get_mvv_lva_key(board, move)
+        if ply < len(self.killers) and move in self.killers[ply]:
+            return (self.KILLER, self.killers[ply].index(move), 0)
+        return (self.QUIET, -self.history[move[0] * MAILBOX_SIZE + move[1]], 0)
+
+    def order_moves(self, moves: list, board: list, ply: int, hash_move: tuple = None) -> list:
+        """This method returns the moves (pairs of squares) of a position in search order"""
+        return sorted(moves, key=lambda move: self.get_move_key(board, move, ply, hash_move))
+
+    def update(self, board: list, move: tuple, ply: int, depth: int) -> None:
+        """This method records a move (a pair of squares) that caused a cutoff at a ply,
+        with the remaining depth: a quiet move becomes a killer move of the ply
+        and its history score grows with the square of the depth"""
+        if board[move[1]] != EMPTY:
+            return
+
+        # .Killer moves
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.NUMBER_OF_KILLERS:]
+
+        # .History score
+        self.history[move[0] * MAILBOX_SIZE + move[1]] += depth * depth
+
+    # [END METHODS]
@@ -0,0 +1,128 @@
+"""Module providing the per-square move tables of the leaping pieces,
+built once at import time on the padded mailbox"""
+from board_encoding import (
+    MAILBOX_SIZE, ROW_STRIDE, SQUARES, SQUARE_TO_POSITION, IN_PALACE,
+    RIVER_SQUARE, RED, BLACK, to_square,
+)
+
+# [BEGIN CONSTANTS]
+# Offsets on the mailbox
+ORTHOGONAL_OFFSETS = (ROW_STRIDE, -ROW_STRIDE, 1, -1)
+DIAGONAL_OFFSETS = (ROW_STRIDE + 1, ROW_STRIDE - 1, -ROW_STRIDE - 1, -ROW_STRIDE + 1)
+
+# Horse goal offsets and their leg offsets (one leg for every 2 goals)
+HORSE_GOAL_OFFSETS = (
+    2 * ROW_STRIDE + 1, 2 * ROW_STRIDE - 1, ROW_STRIDE - 2, -ROW_STRIDE - 2,
+    -2 * ROW_STRIDE - 1, -2 * ROW_STRIDE + 1, -ROW_STRIDE + 2, ROW_STRIDE + 2,
+)
+HORSE_LEG_OFFSETS = (ROW_STRIDE, -1, -ROW_STRIDE, 1)
+
+# Elephant goal offsets and their eye offsets
+ELEPHANT_GOAL_OFFSETS = (
+    2 * ROW_STRIDE + 2, 2 * ROW_STRIDE - 2, -2 * ROW_STRIDE + 2, -2 * ROW_STRIDE - 2,
+)
+ELEPHANT_EYE_OFFSETS = (ROW_STRIDE + 1, ROW_STRIDE - 1, -ROW_STRIDE + 1, -ROW_STRIDE - 1)
+
+# Offsets of a horse attacking a square and of the leg it needs to be free
+# (the leg of an attacking horse is diagonal to the attacked square)
+HORSE_ATTACK_OFFSETS = (
+    2 * ROW_STRIDE - 1, ROW_STRIDE - 2, -ROW_STRIDE - 2, -2 * ROW_STRIDE - 1,
+    -2 * ROW_STRIDE + 1, -ROW_STRIDE + 2, ROW_STRIDE + 2, 2 * ROW_STRIDE + 1,
+)
+HORSE_ATTACK_LEG_OFFSETS = (ROW_STRIDE - 1, -ROW_STRIDE - 1, -ROW_STRIDE + 1, ROW_STRIDE + 1)
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def _is_on_board(square: int) -> bool:
+    """This function returns True if a mailbox square is on the board"""
+    return 0 <= square < MAILBOX_SIZE and SQUARE_TO_POSITION[square] is not None
+
+
+def _is_on_own_side(square: int, colour: int) -> bool:
+    """This function returns True if a square is on the own side of the river of a team"""
+    if colour == RED:
+        return square >= RIVER_SQUARE
+    return square < RIVER_SQUARE
+
+
+def _build_horse_moves() -> list:
+    """This function builds the (goal, leg) pairs of a horse on every square"""
+    table = [()] * MAILBOX_SIZE
+    for square in SQUARES:
+        table[square] = tuple(
+            (square + HORSE_GOAL_OFFSETS[cnt], square + HORSE_LEG_OFFSETS[cnt // 2])
+            for cnt in range(8)
+            if _is_on_board(square + HORSE_GOAL_OFFSETS[cnt])
+        )
+    return table
+
+
+def _build_horse_attacks() -> list:
+    """This function builds the (horse square, leg) pairs attacking every square"""
+    table = [()] * MAILBOX_SIZE
+    for square in SQUARES:
+        table[square] = tuple(
+            (square + HORSE_ATTACK_OFFSETS[index], square + HORSE_ATTACK_LEG_OFFSETS[index // 2])
+            for index in range(8)
+            if _is_on_board(square + HORSE_ATTACK_OFFSETS[index])
+        )
+    return table
+
+
+def _build_elephant_moves(colour: int) -> list:
+    """This function builds the (goal, eye) pairs of an elephant of a team on every square"""
+    table = [()] * MAILBOX_SIZE
+    for square in SQUARES:
+        table[square] = tuple(
+            (square + ELEPHANT_GOAL_OFFSETS[direction], square + ELEPHANT_EYE_OFFSETS[direction])
+            for direction in range(4)
+            if _is_on_board(square + ELEPHANT_GOAL_OFFSETS[direction])
+            and _is_on_own_side(square + ELEPHANT_GOAL_OFFSETS[direction], colour)
+        )
+    return table
+
+
+def _build_palace_moves(offsets: tuple) -> list:
+    """This function builds the goals inside the palace for every square"""
+    table = [()] * MAILBOX_SIZE
+    for square in SQUARES:
+        table[square] = tuple(
+            square + offset for offset in offsets if IN_PALACE[square + offset]
+        )
+    return table
+
+
+def _build_pawn_moves(colour: int) -> list:
+    """This function builds the goals of a pawn of a team on every square"""
+    forward = -ROW_STRIDE if colour == RED else ROW_STRIDE
+    table = [()] * MAILBOX_SIZE
+    for square in SQUARES:
+        goals = [forward]
+        # The pawn can move sideways once it has crossed the river
+        if not _is_on_own_side(square, colour):
+            goals += [1, -1]
+        table[square] = tuple(
+            square + offset for offset in goals if _is_on_board(square + offset)
+        )
+    return table
+
+
+def _build_palace_squares(colour: int) -> tuple:
+    """This function lists the squares of the palace of a team (column by column)"""
+    rows = range(7, 10) if colour == RED else range(0, 3)
+    return tuple(to_square((x, y)) for y in range(3, 6) for x in rows)
+
+
+# [END FUNCTIONS]
+
+# [BEGIN TABLES]
+HORSE_MOVES = _build_horse_moves()
+HORSE_ATTACKS = _build_horse_attacks()
+ELEPHANT_MOVES = {RED: _build_elephant_moves(RED), BLACK: _build_elephant_moves(BLACK)}
+ADVISOR_MOVES = _build_palace_moves(DIAGONAL_OFFSETS)
+GENERAL_MOVES = _build_palace_moves(ORTHOGONAL_OFFSETS)
+PAWN_MOVES = {RED: _build_pawn_moves(RED), BLACK: _build_pawn_moves(BLACK)}
+PALACE_SQUARES = {RED: _build_palace_squares(RED), BLACK: _build_palace_squares(BLACK)}
+# [END TABLES]
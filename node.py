@@ -4,6 +4,11 @@ from math import inf, sqrt, log
 from abc import ABC, abstractmethod
 from random import choice, shuffle
 from game_state import GameState
+import batch_evaluation
+from board_encoding import EMPTY, HORSE, ROOK, CANNON, TYPE_MASK, TEAM_TO_COLOUR, SQUARE_TO_POSITION, to_square
+from transposition_table import TranspositionTable
+from search import SearchContext
+from quiescence import quiescence_search
 from team import Team
 
 
@@ -16,11 +21,23 @@ class Node(ABC):
         self.parent = parent
         self.parent_move = parent_move
         self.list_of_children = list()
+        # Children indexed by their move (a pair of squares), so that the tree
+        # can move to the child of a played move without comparing the positions
+        self._children_by_move = {}
 
         # Node statistics
         self.game_state = game_state
         self._is_generated_all_children = False
 
+        # Node budget of the game tree, shared with the parent (None for a node outside a tree)
+        self.budget = parent.budget if parent is not None else None
+
+    # Properties initialization
+    @property
+    def zobrist_key(self) -> int:
+        """Return the Zobrist key of the node's game state"""
+        return self.game_state.zobrist_key
+
     # [END INITIALIZATION]
 
     # [BEGIN METHOD]
@@ -44,9 +61,54 @@ class Node(ABC):
         """This method fills up the list of children nodes"""
         if self._is_generated_all_children:
             return
-        self.list_of_children = self.get_all_children()
+        for child in self.get_all_children():
+            if self.find_child(self._get_move_of_child(child)) is None:
+                self._add_child(child)
         self._is_generated_all_children = True
 
+    def find_child(self, move: tuple):
+        """This method returns the child reached by a move (a pair of squares),
+        or None if it has not been created"""
+        return self._children_by_move.get(move)
+
+    def count_subtree(self) -> int:
+        """This method returns the number of nodes of the subtree of the node, the node included"""
+        number_of_nodes = 0
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            number_of_nodes += 1
+            nodes.extend(node.list_of_children)
+        return number_of_nodes
+
+    def release_children(self) -> int:
+        """This method releases the subtrees below the node, which keeps its own statistics,
+        and returns the number of released nodes"""
+        number_of_nodes = self.count_subtree() - 1
+        self.list_of_children = list()
+        self._children_by_move = {}
+        self._is_generated_all_children = False
+        if self.budget is not None:
+            self.budget.release(number_of_nodes)
+        return number_of_nodes
+
+    # Private methods
+    def _add_child(self, child, move: tuple = None) -> None:
+        """This method adds a child to the list of children and indexes it by its move
+        (a pair of squares, found from the parent move of the child if not given)"""
+        if move is None:
+            move = self._get_move_of_child(child)
+        self._children_by_move[move] = child
+        self.list_of_children.append(child)
+        if self.budget is not None:
+            self.budget.add()
+
+    @staticmethod
+    def _get_move_of_child(child) -> tuple:
+        """This method returns the move (a pair of squares) that reaches a child"""
+        old_pos, new_pos = child.parent_move
+        return to_square(old_pos), to_square(new_pos)
+
     # Abstract method
     @abstractmethod
     def _create_node(self, game_state: GameState, parent, parent_move: tuple):
@@ -59,34 +121,147 @@ class Node(ABC):
 class NodeMinimax(Node):
     """This class represents a "minimax's node" in the game tree"""
 
+    # [BEGIN CONSTANTS]
+
+    # Width of the null windows of the principal variation search
+    # (smaller than the difference between two distinct values)
+    NULL_WINDOW = 1e-6
+
+    # Selective search (see SearchContext)
+    # .Null-move pruning: depth reduction of the null move, minimum remaining depth,
+    # and minimum number of rooks, horses and cannons of the team to move (zugzwang guard)
+    NULL_MOVE_REDUCTION = 2
+    NULL_MOVE_MIN_DEPTH = 3
+    NULL_MOVE_MIN_ATTACKERS = 2
+    # .Late move reductions: the quiet moves after the first few ones are searched
+    # one ply shallower, and searched again at full depth if they raise the score
+    LATE_MOVE_MIN_INDEX = 3
+    LATE_MOVE_MIN_DEPTH = 3
+    LATE_MOVE_REDUCTION = 1
+    # .Futility pruning at the frontier nodes (depth 1) and razoring at depth 2
+    FUTILITY_MARGIN = 30
+    RAZORING_DEPTH = 2
+    RAZORING_MARGIN = 60
+
+    # [END CONSTANTS]
+
     # [BEGIN INITIALIZATION]
     def __init__(self, game_state: GameState, parent, parent_move: tuple) -> None:
-        # Reference to a node
+        # Reference to a node (the parent move of the node of a null move is None)
         super().__init__(game_state, parent, parent_move)
 
+        # Valid moves of the node (pairs of squares): a child is only created
+        # when the search visits it
+        self._moves = None
+
         # Minimax statistics
-        self._is_children_sorted = False
         self.minimax_value = None
+        # Best child found by the last search of the node (so far, if the search was stopped)
+        self.best_child = None
+
+    # Properties initialization
+    # .moves
+    @property
+    def moves(self) -> list:
+        """This is the Getter function of the valid moves of the node (pairs of squares)"""
+        if self._moves is None:
+            self._moves = self.game_state.status.valid_moves
+        return self._moves
 
     # [END INITIALIZATION]
 
     # [BEGIN METHOD]
     # Instance methods
+    def get_child(self, move: tuple):
+        """This method returns the child reached by a move (a pair of squares),
+        which is created the first time and added to the list of children"""
+        child = self.find_child(move)
+        if child is None:
+            game_state, parent_move = self.game_state._generate_game_state_with_squares(move[0], move[1], True)
+            child = self._create_node(game_state, self, parent_move)
+            self._add_child(child, move)
+        return child
+
+    def generate_all_children(self) -> None:
+        """This method creates the children that have not been created yet"""
+        if self._is_generated_all_children:
+            return
+        for move in self.moves:
+            self.get_child(move)
+        self._is_generated_all_children = True
+
+    def release_children(self) -> int:
+        """This method releases the subtrees below the node, which keeps its value,
+        and returns the number of released nodes"""
+        number_of_nodes = super().release_children()
+        # The best move stays in the transposition table
+        self.best_child = None
+        return number_of_nodes
+
     def minimax(
-        self, depth: int, max_turn: bool, alpha: float = -inf, beta: float = inf
+        self,
+        depth: int,
+        max_turn: bool,
+        alpha: float = -inf,
+        beta: float = inf,
+        search_context: SearchContext = None,
+        ply: int = 0,
     ) -> float:
-        """Minimax method"""
+        """Minimax method (the search context, with the transposition table
+        and the deadline, is optional; the ply is the distance from the root of the search)"""
 
+        if search_context is None:
+            search_context = SearchContext()
+
+        # Search below the root on a single position instead of child nodes
+        if search_context.depth_first and self.parent is not None and depth > 0:
+            if self.game_state._current_team is Team.RED:
+                return self._search_depth_first(depth, alpha, beta, search_context, ply)
+            return -self._search_depth_first(depth, -beta, -alpha, search_context, ply)
+
+        # Raise SearchStopped if the search runs out of time
+        search_context.count_node()
+        transposition_table = search_context.transposition_table
+
+        # The best move of the previous search of the node is searched first
+        previous_best_move = self._get_best_move()
         self.minimax_value = None
+        self.best_child = None
+
         # If the node reaches the target depth
         if depth == 0:
-            self.minimax_value = self.game_state.value
+            self.minimax_value = self._get_leaf_value(alpha, beta, search_context)
             return self.minimax_value
 
-        self.generate_all_children()
-
-        # If the node has no child nodes
-        if len(self.list_of_children) == 0:
+        # Look the position up in the transposition table
+        original_alpha, original_beta = alpha, beta
+        hash_move = previous_best_move
+        if transposition_table is not None:
+            entry = transposition_table.probe(self.zobrist_key)
+            if entry is not None:
+                entry_depth, score, bound, entry_move = entry
+                hash_move = entry_move or hash_move
+                # The root is always searched, so that its children have a value
+                if entry_depth >= depth and self.parent is not None:
+                    if bound == TranspositionTable.EXACT:
+                        self.minimax_value = score
+                        return score
+                    if bound == TranspositionTable.LOWER_BOUND:
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        self.minimax_value = score
+                        return score
+
+        # Razoring and null-move pruning
+        pruned_value = self._get_pruned_value(depth, max_turn, alpha, beta, search_context, ply)
+        if pruned_value is not None:
+            self.minimax_value = pruned_value
+            return pruned_value
+
+        # If the node has no valid move
+        if len(self.moves) == 0:
             if self.game_state._current_team is Team.RED:
                 self.minimax_value = -inf
             else:
@@ -94,47 +269,537 @@ class NodeMinimax(Node):
 
             return self.minimax_value
 
+        # The moves are ordered without creating the children,
+        # which are only created when they are searched
+        moves = self._order_moves(search_context, ply, hash_move)
+        futility_value = self._get_futility_value(depth, max_turn, search_context)
+
         # Maximizing player's turn
         if max_turn is True:
             best_value = -inf
 
-            # Sort the list of children
-            if self._is_children_sorted is False:
-                self.list_of_children.sort(
-                    key=lambda node: node.game_state.value, reverse=True
-                )
-                self._is_children_sorted = True
-
             # Go to the deeper depth
-            for child in self.list_of_children:
-                value = child.minimax(depth - 1, False, alpha, beta)
+            for index, move in enumerate(moves):
+                # The quiet moves that cannot raise alpha are pruned
+                if futility_value is not None and futility_value <= alpha and self._is_quiet_move(move):
+                    best_value = max(best_value, futility_value)
+                    continue
+
+                child = self.get_child(move)
+                reduction = self._get_reduction(depth, index, move, search_context)
+                value = child.minimax(depth - 1 - reduction, False, alpha, beta, search_context, ply + 1)
+                if reduction > 0 and value > alpha:
+                    value = child.minimax(depth - 1, False, alpha, beta, search_context, ply + 1)
+
+                if value > best_value or self.best_child is None:
+                    self.best_child = child
                 best_value = max(best_value, value)
                 alpha = max(alpha, best_value)
                 if beta <= alpha:
+                    search_context.move_ordering.update(self.game_state.board, move, ply, depth)
                     break
-            self.minimax_value = best_value
-            return best_value
 
         # Minimizing player's turn
         else:
             best_value = inf
 
-            # Sort the list of children
-            if self._is_children_sorted is False:
-                self.list_of_children.sort(
-                    key=lambda node: node.game_state.value, reverse=False
-                )
-                self._is_children_sorted = True
-
             # Go to the deeper depth
-            for child in self.list_of_children:
-                value = child.minimax(depth - 1, True, alpha, beta)
+            for index, move in enumerate(moves):
+                # The quiet moves that cannot lower beta are pruned
+                if futility_value is not None and futility_value >= beta and self._is_quiet_move(move):
+                    best_value = min(best_value, futility_value)
+                    continue
+
+                child = self.get_child(move)
+                reduction = self._get_reduction(depth, index, move, search_context)
+                value = child.minimax(depth - 1 - reduction, True, alpha, beta, search_context, ply + 1)
+                if reduction > 0 and value < beta:
+                    value = child.minimax(depth - 1, True, alpha, beta, search_context, ply + 1)
+
+                if value < best_value or self.best_child is None:
+                    self.best_child = child
                 best_value = min(best_value, value)
                 beta = min(beta, best_value)
                 if beta <= alpha:
+                    search_context.move_ordering.update(self.game_state.board, move, ply, depth)
                     break
-            self.minimax_value = best_value
-            return best_value
+
+        # Store the result with the type of its bound
+        if transposition_table is not None:
+            if best_value <= original_alpha:
+                bound = TranspositionTable.UPPER_BOUND
+            elif best_value >= original_beta:
+                bound = TranspositionTable.LOWER_BOUND
+            else:
+                bound = TranspositionTable.EXACT
+            transposition_table.store(self.zobrist_key, depth, best_value, bound, self._get_best_move())
+
+        self.minimax_value = best_value
+        return best_value
+
+    def negamax(
+        self,
+        depth: int,
+        alpha: float = -inf,
+        beta: float = inf,
+        search_context: SearchContext = None,
+        ply: int = 0,
+    ) -> float:
+        """Negamax method with the principal variation search: the first child is
+        searched with the full window, the others with a null window around alpha,
+        and searched again only if they fail high. The value is returned from the
+        point of view of the team to move (the minimax value of the node is kept
+        from the point of view of the red team)"""
+
+        if search_context is None:
+            search_context = SearchContext()
+
+        # Search below the root on a single position instead of child nodes
+        if search_context.depth_first and self.parent is not None and depth > 0:
+            return self._search_depth_first(depth, alpha, beta, search_context, ply)
+
+        # Raise SearchStopped if the search runs out of time
+        search_context.count_node()
+        transposition_table = search_context.transposition_table
+
+        # The best move of the previous search of the node is searched first
+        previous_best_move = self._get_best_move()
+        self.minimax_value = None
+        self.best_child = None
+
+        # 1 if the red team is to move, -1 otherwise
+        sign = self.game_state._current_team.value
+
+        # If the node reaches the target depth
+        if depth == 0:
+            if sign == 1:
+                self.minimax_value = self._get_leaf_value(alpha, beta, search_context)
+            else:
+                self.minimax_value = self._get_leaf_value(-beta, -alpha, search_context)
+            return sign * self.minimax_value
+
+        # Look the position up in the transposition table
+        # (its scores are from the point of view of the red team)
+        original_alpha = alpha
+        hash_move = previous_best_move
+        if transposition_table is not None:
+            entry = transposition_table.probe(self.zobrist_key)
+            if entry is not None:
+                entry_depth, score, bound, entry_move = entry
+                hash_move = entry_move or hash_move
+                # The root is always searched, so that it has a best child
+                if entry_depth >= depth and self.parent is not None:
+                    score *= sign
+                    if bound == TranspositionTable.EXACT:
+                        self.minimax_value = sign * score
+                        return score
+                    if (bound == TranspositionTable.LOWER_BOUND) == (sign == 1):
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        self.minimax_value = sign * score
+                        return score
+
+        # Razoring and null-move pruning (with the window of the red team)
+        if sign == 1:
+            pruned_value = self._get_pruned_value(depth, True, alpha, beta, search_context, ply)
+        else:
+            pruned_value = self._get_pruned_value(depth, False, -beta, -alpha, search_context, ply)
+        if pruned_value is not None:
+            self.minimax_value = pruned_value
+            return sign * pruned_value
+
+        # If the node has no valid move, the team to move has lost
+        if len(self.moves) == 0:
+            self.minimax_value = -sign * inf
+            return -inf
+
+        # The moves are ordered without creating the children,
+        # which are only created when they are searched
+        moves = self._order_moves(search_context, ply, hash_move)
+        futility_value = self._get_futility_value(depth, sign == 1, search_context)
+        if futility_value is not None:
+            futility_value *= sign
+
+        best_value = -inf
+        for index, move in enumerate(moves):
+            # The quiet moves that cannot raise alpha are pruned
+            if futility_value is not None and futility_value <= alpha and self._is_quiet_move(move):
+                best_value = max(best_value, futility_value)
+                continue
+
+            child = self.get_child(move)
+            if index == 0 or alpha == -inf:
+                value = -child.negamax(depth - 1, -beta, -alpha, search_context, ply + 1)
+            else:
+                # Prove that the child is not better than alpha with a null window
+                # (at a reduced depth for the late quiet moves), and search it again
+                # with the full window if it is (there is no null window until alpha is finite)
+                reduction = self._get_reduction(depth, index, move, search_context)
+                value = -child.negamax(
+                    depth - 1 - reduction, -alpha - self.NULL_WINDOW, -alpha, search_context, ply + 1
+                )
+                if reduction > 0 and value > alpha:
+                    value = -child.negamax(
+                        depth - 1, -alpha - self.NULL_WINDOW, -alpha, search_context, ply + 1
+                    )
+                if alpha < value < beta:
+                    value = -child.negamax(depth - 1, -beta, -alpha, search_context, ply + 1)
+
+            if value > best_value or self.best_child is None:
+                best_value = value
+                self.best_child = child
+            alpha = max(alpha, value)
+            if beta <= alpha:
+                search_context.move_ordering.update(self.game_state.board, move, ply, depth)
+                break
+
+        # Store the result from the point of view of the red team with the type of its bound
+        if transposition_table is not None:
+            if best_value <= original_alpha:
+                is_upper_bound = True
+            elif best_value >= beta:
+                is_upper_bound = False
+            else:
+                is_upper_bound = None
+
+            if is_upper_bound is None:
+                bound = TranspositionTable.EXACT
+            elif is_upper_bound == (sign == 1):
+                bound = TranspositionTable.UPPER_BOUND
+            else:
+                bound = TranspositionTable.LOWER_BOUND
+            transposition_table.store(self.zobrist_key, depth, sign * best_value, bound, self._get_best_move())
+
+        self.minimax_value = sign * best_value
+        return best_value
+
+    def _get_leaf_value(
+        self, alpha: float = -inf, beta: float = inf, search_context: SearchContext = None
+    ) -> float:
+        """This method returns the value of a node at the target depth, after the
+        quiescence search if the search context asks for it (the window and the
+        value are from the point of view of the red team)"""
+        if search_context is None or search_context.quiescence is False:
+            return self.game_state.value
+
+        # The quiescence search works from the point of view of the team to move
+        # (the game state is given back unchanged)
+        if self.game_state._current_team is Team.RED:
+            return quiescence_search(
+                self.game_state, alpha, beta, search_context.quiescence_checks, search_context
+            )
+        return -quiescence_search(
+            self.game_state, -beta, -alpha, search_context.quiescence_checks, search_context
+        )
+
+    def _order_moves(self, search_context: SearchContext, ply: int, hash_move: tuple = None) -> list:
+        """This method returns the valid moves in search order (see move_ordering.py):
+        the hash move (a pair of board positions), the captures, the killer moves
+        and then the quiet moves. The moves are ordered from the board of the node,
+        without creating or evaluating the children"""
+        if hash_move is not None:
+            hash_move = (to_square(hash_move[0]), to_square(hash_move[1]))
+        return search_context.move_ordering.order_moves(self.moves, self.game_state.board, ply, hash_move)
+
+    def _get_pruned_value(
+        self, depth: int, max_turn: bool, alpha: float, beta: float, search_context: SearchContext, ply: int
+    ) -> float:
+        """This method returns the value of the node if the selective search prunes it
+        before its children are generated (razoring or null-move pruning), None otherwise.
+        The window and the value are from the point of view of the red team"""
+        # The root, the positions in check and the finished games are never pruned
+        status = self.game_state.status
+        if self.parent is None or status.is_in_check or status.is_terminal:
+            return None
+
+        # .Razoring: a position far below the window is resolved by its leaf value
+        if search_context.futility and depth == self.RAZORING_DEPTH:
+            static_value = self.game_state.value
+            if max_turn and static_value + self.RAZORING_MARGIN <= alpha:
+                value = self._get_leaf_value(alpha, beta, search_context)
+                if value <= alpha:
+                    return value
+            elif not max_turn and static_value - self.RAZORING_MARGIN >= beta:
+                value = self._get_leaf_value(alpha, beta, search_context)
+                if value >= beta:
+                    return value
+
+        # .Null-move pruning: if the team to move passes its turn and a shallower search
+        # still fails high, a real move would fail high as well
+        if search_context.null_move and self._can_pass(depth):
+            # The node of the null move is not kept as a child, so its subtree is released after the search
+            null_child = self._create_node(self.game_state.generate_game_state_with_null_move(), self, None)
+            null_depth = depth - 1 - self.NULL_MOVE_REDUCTION
+            if max_turn and beta < inf:
+                value = null_child.minimax(
+                    null_depth, False, beta - self.NULL_WINDOW, beta, search_context, ply + 1
+                )
+                null_child.release_children()
+                if value >= beta:
+                    return beta
+            elif not max_turn and alpha > -inf:
+                value = null_child.minimax(
+                    null_depth, True, alpha, alpha + self.NULL_WINDOW, search_context, ply + 1
+                )
+                null_child.release_children()
+                if value <= alpha:
+                    return alpha
+
+        return None
+
+    def _can_pass(self, depth: int) -> bool:
+        """This method returns True if the null-move pruning can be tried at the node:
+        the depth is large enough, the previous move is not a null move, and the team
+        to move has enough attacking pieces to not be in zugzwang"""
+        if depth < self.NULL_MOVE_MIN_DEPTH or self.parent_move is None:
+            return False
+
+        return self._has_null_move_material(self.game_state)
+
+    def _has_null_move_material(self, game_state: GameState) -> bool:
+        """This method returns True if the team to move has enough attacking pieces
+        to not be in zugzwang (the guard of the null-move pruning)"""
+        board = game_state.board
+        colour = TEAM_TO_COLOUR[game_state._current_team]
+        attackers = 0
+        for square in game_state.piece_squares[colour]:
+            if board[square] & TYPE_MASK in (HORSE, ROOK, CANNON):
+                attackers += 1
+        return attackers >= self.NULL_MOVE_MIN_ATTACKERS
+
+    def _get_futility_value(self, depth: int, max_turn: bool, search_context: SearchContext) -> float:
+        """This method returns the optimistic value of the quiet moves of a frontier node
+        (from the point of view of the red team) if they can be pruned, None otherwise"""
+        if (
+            search_context.futility is False
+            or depth != 1
+            or self.parent is None
+            or self.game_state.status.is_in_check
+        ):
+            return None
+
+        if max_turn:
+            return self.game_state.value + self.FUTILITY_MARGIN
+        return self.game_state.value - self.FUTILITY_MARGIN
+
+    def _get_reduction(self, depth: int, index: int, move: tuple, search_context: SearchContext) -> int:
+        """This method returns the depth reduction of the search of a move
+        (late move reductions of the quiet moves)"""
+        if (
+            search_context.late_move_reductions is False
+            or index < self.LATE_MOVE_MIN_INDEX
+            or depth < self.LATE_MOVE_MIN_DEPTH
+            or self.parent is None
+            or self.game_state.status.is_in_check
+            or not self._is_quiet_move(move)
+        ):
+            return 0
+
+        return self.LATE_MOVE_REDUCTION
+
+    def _is_quiet_move(self, move: tuple) -> bool:
+        """This method returns True if a move (a pair of squares) neither captures nor gives check"""
+        if self.game_state.board[move[1]] != EMPTY:
+            return False
+        return not self.game_state.is_move_giving_check(move)
+
+    def _search_depth_first(
+        self, depth: int, alpha: float, beta: float, search_context: SearchContext, ply: int
+    ) -> float:
+        """This method searches the node on a copy of its game state, with the moves made
+        and taken back in place, so no child node is created below it. The window and the
+        value are from the point of view of the team to move (the minimax value of the
+        node is kept from the point of view of the red team)"""
+        self.best_child = None
+        value = self._search_position(
+            self.game_state.copy(), depth, alpha, beta, search_context, ply, self.parent_move is not None
+        )
+        self.minimax_value = self.game_state._current_team.value * value
+        return value
+
+    def _search_position(
+        self,
+        game_state: GameState,
+        depth: int,
+        alpha: float,
+        beta: float,
+        search_context: SearchContext,
+        ply: int,
+        can_pass: bool = True,
+    ) -> float:
+        """This method is the depth-first negamax of the depth-first mode, with the same
+        transposition table, move ordering, principal variation search and selective
+        search as the nodes. The game state is given back unchanged unless the search
+        is stopped. The value is from the point of view of the team to move"""
+        # Raise SearchStopped if the search runs out of time
+        search_context.count_node()
+        transposition_table = search_context.transposition_table
+
+        # 1 if the red team is to move, -1 otherwise
+        sign = game_state._current_team.value
+
+        # If the position reaches the target depth
+        if depth == 0:
+            return self._get_position_leaf_value(game_state, alpha, beta, search_context)
+
+        # Look the position up in the transposition table
+        # (its scores are from the point of view of the red team)
+        original_alpha = alpha
+        hash_move = None
+        if transposition_table is not None:
+            entry = transposition_table.probe(game_state.zobrist_key)
+            if entry is not None:
+                entry_depth, score, bound, entry_move = entry
+                if entry_move is not None:
+                    hash_move = (to_square(entry_move[0]), to_square(entry_move[1]))
+                if entry_depth >= depth:
+                    score *= sign
+                    if bound == TranspositionTable.EXACT:
+                        return score
+                    if (bound == TranspositionTable.LOWER_BOUND) == (sign == 1):
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        return score
+
+        # If the position has no valid move, the team to move has lost
+        status = game_state.status
+        if len(status.valid_moves) == 0:
+            return -inf
+
+        board = game_state.board
+        is_in_check = status.is_in_check
+        if not is_in_check:
+            # .Razoring: a position far below the window is resolved by its leaf value
+            if search_context.futility and depth == self.RAZORING_DEPTH:
+                if sign * game_state.value + self.RAZORING_MARGIN <= alpha:
+                    value = self._get_position_leaf_value(game_state, alpha, beta, search_context)
+                    if value <= alpha:
+                        return value
+
+            # .Null-move pruning
+            if (
+                search_context.null_move
+                and can_pass
+                and depth >= self.NULL_MOVE_MIN_DEPTH
+                and beta < inf
+                and self._has_null_move_material(game_state)
+            ):
+                undo = game_state.make_null_move()
+                value = -self._search_position(
+                    game_state,
+                    depth - 1 - self.NULL_MOVE_REDUCTION,
+                    -beta,
+                    -beta + self.NULL_WINDOW,
+                    search_context,
+                    ply + 1,
+                    False,
+                )
+                game_state.unmake_null_move(undo)
+                if value >= beta:
+                    return beta
+
+        move_ordering = search_context.move_ordering
+        moves = move_ordering.order_moves(status.valid_moves, board, ply, hash_move)
+        futility_value = None
+        if search_context.futility and depth == 1 and not is_in_check:
+            futility_value = sign * game_state.value + self.FUTILITY_MARGIN
+
+        best_value = -inf
+        best_move = None
+        for index, move in enumerate(moves):
+            # The checks are found on the board before the move (without generating the moves
+            # of the child), and only if the futility pruning or the late move reductions apply
+            is_quiet = (
+                (futility_value is not None or search_context.late_move_reductions)
+                and board[move[1]] == EMPTY
+                and not game_state.is_move_giving_check(move)
+            )
+
+            # The quiet moves that cannot raise alpha are pruned
+            if futility_value is not None and futility_value <= alpha and is_quiet:
+                best_value = max(best_value, futility_value)
+                continue
+
+            undo = game_state.make_move(move)
+            if index == 0 or alpha == -inf:
+                value = -self._search_position(game_state, depth - 1, -beta, -alpha, search_context, ply + 1)
+            else:
+                # Null window first (at a reduced depth for the late quiet moves),
+                # and the full window again if the move is better than alpha
+                reduction = 0
+                if (
+                    search_context.late_move_reductions
+                    and is_quiet
+                    and not is_in_check
+                    and index >= self.LATE_MOVE_MIN_INDEX
+                    and depth >= self.LATE_MOVE_MIN_DEPTH
+                ):
+                    reduction = self.LATE_MOVE_REDUCTION
+                value = -self._search_position(
+                    game_state, depth - 1 - reduction, -alpha - self.NULL_WINDOW, -alpha, search_context, ply + 1
+                )
+                if reduction > 0 and value > alpha:
+                    value = -self._search_position(
+                        game_state, depth - 1, -alpha - self.NULL_WINDOW, -alpha, search_context, ply + 1
+                    )
+                if alpha < value < beta:
+                    value = -self._search_position(game_state, depth - 1, -beta, -alpha, search_context, ply + 1)
+            game_state.unmake_move(undo)
+
+            if value > best_value or best_move is None:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, value)
+            if beta <= alpha:
+                move_ordering.update(board, move, ply, depth)
+                break
+
+        # Store the result from the point of view of the red team with the type of its bound
+        if transposition_table is not None:
+            if best_value <= original_alpha:
+                is_upper_bound = True
+            elif best_value >= beta:
+                is_upper_bound = False
+            else:
+                is_upper_bound = None
+
+            if is_upper_bound is None:
+                bound = TranspositionTable.EXACT
+            elif is_upper_bound == (sign == 1):
+                bound = TranspositionTable.UPPER_BOUND
+            else:
+                bound = TranspositionTable.LOWER_BOUND
+            transposition_table.store(
+                game_state.zobrist_key,
+                depth,
+                sign * best_value,
+                bound,
+                None if best_move is None else (SQUARE_TO_POSITION[best_move[0]], SQUARE_TO_POSITION[best_move[1]]),
+            )
+
+        return best_value
+
+    def _get_position_leaf_value(
+        self, game_state: GameState, alpha: float, beta: float, search_context: SearchContext
+    ) -> float:
+        """This method returns the value of a position at the target depth of the depth-first
+        mode, after the quiescence search if the search context asks for it (the window
+        and the value are from the point of view of the team to move)"""
+        if search_context.quiescence is False:
+            return game_state._current_team.value * game_state.value
+
+        return quiescence_search(game_state, alpha, beta, search_context.quiescence_checks, search_context)
+
+    def _get_best_move(self) -> tuple:
+        """This method returns the move to the best child of the last search of the node,
+        or None if the node has not been searched or every move was pruned"""
+        if self.best_child is None:
+            return None
+        return self.best_child.parent_move
 
     def _create_node(self, game_state: GameState, parent, parent_move: tuple):
         """This method creates a new minimax node"""
@@ -248,8 +913,13 @@ class NodeMCTS(Node):
 
     def terminate_value(self, is_end: bool) -> float:
         """This module returns the value if a node is at it's termination"""
+        return self._get_terminate_value(self.game_state, is_end)
+
+    @staticmethod
+    def _get_terminate_value(game_state: GameState, is_end: bool) -> float:
+        """This module returns the value if a game state is at the end of a rollout"""
         if is_end:
-            winning_team = self.game_state.get_team_win()
+            winning_team = game_state.get_team_win()
             if winning_team is Team.RED:
                 return 1
             elif winning_team is Team.BLACK:
@@ -257,11 +927,11 @@ class NodeMCTS(Node):
             elif winning_team is Team.NONE:
                 return 0
         else:
-            if self.game_state.value == inf:
+            if game_state.value == inf:
                 return 1
-            elif self.game_state.value == -inf:
+            elif game_state.value == -inf:
                 return -1
-            return self.game_state.value / 1000
+            return game_state.value / 1000
 
     def rollout_policy(self, value_pack):
         """This method returns the chosen simulation initialize node
@@ -302,6 +972,9 @@ class NodeMCTS(Node):
                 return None
 
             if self.is_children_sorted is False:
+                batch_evaluation.evaluate_game_states(
+                    [child[0] for child in self.game_state.all_child_gamestates]
+                )
                 self.game_state.all_child_gamestates.sort(
                     key=lambda child: child[0].value, reverse=True
                 )
@@ -319,6 +992,10 @@ class NodeMCTS(Node):
 
     def rollout(self, rollout_policy, target_depth: int = MAX_NODE_COUNT):
         """This method performs the rollout simulation"""
+        # The random policy walks a single mutable copy of the game state
+        if rollout_policy == "RANDOM":
+            return self._random_rollout(target_depth)
+
         node_count = 0
         current_node = self
         while node_count < target_depth:
@@ -333,6 +1010,19 @@ class NodeMCTS(Node):
 
         return current_node.terminate_value(False)
 
+    def _random_rollout(self, target_depth: int) -> float:
+        """This method performs the random rollout simulation with make_move,
+        without creating a node or a game state for every step"""
+        position = self.game_state.copy()
+        for _ in range(target_depth):
+            move = position.generate_random_move()
+            # If the current position is terminal, return
+            if move is None:
+                return self._get_terminate_value(position, True)
+            position.make_move(move)
+
+        return self._get_terminate_value(position, False)
+
     def backpropagate(self, result):
         """This method performs the MCTS backpropagation"""
 
@@ -388,69 +1078,13 @@ class NodeExcavationMinimax(NodeMinimax):
                 res += value * (1 / self.NORMALIZE_CONST**depth)
         return res
 
-    def minimax(
-        self, depth: int, max_turn: bool, alpha: float = -inf, beta: float = inf
-    ):
-        """Excavation Minimax method"""
-
-        self.minimax_value = None
-        # If the node reaches the target depth
-        if depth == 0:
-            temp = self._simulation()
-            self.minimax_value = self.game_state.value + temp
-            return self.minimax_value
-
-        self.generate_all_children()
-        # If the current node has no child nodes
-        if len(self.list_of_children) == 0:
-            if self.game_state._current_team is Team.RED:
-                self.minimax_value = -inf
-            else:
-                self.minimax_value = inf
-
-            return self.minimax_value
-
-        # Maximizing player's turn
-        if max_turn is True:
-            best_value = -inf
-
-            # Sort the list of children
-            if self._is_children_sorted is False:
-                self.list_of_children.sort(
-                    key=lambda node: node.game_state.value, reverse=True
-                )
-                self._is_children_sorted = True
-
-            # Go to the deeper depth
-            for child in self.list_of_children:
-                value = child.minimax(depth - 1, False, alpha, beta)
-                best_value = max(best_value, value)
-                alpha = max(alpha, best_value)
-                if beta <= alpha:
-                    break
-            self.minimax_value = best_value
-            return best_value
-
-        # Minimizing player's turn
-        else:
-            best_value = inf
-
-            # Sort the list of children
-            if self._is_children_sorted is False:
-                self.list_of_children.sort(
-                    key=lambda node: node.game_state.value, reverse=False
-                )
-                self._is_children_sorted = True
-
-            # Go to the deeper depth
-            for child in self.list_of_children:
-                value = child.minimax(depth - 1, True, alpha, beta)
-                best_value = min(best_value, value)
-                beta = min(beta, best_value)
-                if beta <= alpha:
-                    break
-            self.minimax_value = best_value
-            return best_value
+    def _get_leaf_value(
+        self, alpha: float = -inf, beta: float = inf, search_context: SearchContext = None
+    ) -> float:
+        """This method returns the value of a node at the target depth,
+        corrected by the excavation of the lower depths"""
+        temp = self._simulation()
+        return super()._get_leaf_value(alpha - temp, beta - temp, search_context) + temp
 
     def _create_node(self, game_state: GameState, parent, parent_move: tuple):
         """This method creates a new Excavation Minimax node"""
@@ -0,0 +1,77 @@
+"""Module providing the node budget of a game tree, which caps the number of nodes
+(and so the memory) the tree of a bot may keep"""
+import os
+from math import inf
+
+
+class NodeBudget:
+    """This class counts the nodes kept by a game tree against its cap: the smaller of
+    a number of nodes and the number of nodes that fit in a memory cap. A search stops
+    when the cap is exceeded, and the game tree releases its least useful subtrees
+    until it is back under RELEASE_RATIO of the cap"""
+
+    # [BEGIN CONSTANTS]
+    # Estimated memory of a node in bytes, with its game state, its valid moves
+    # and its evaluation (measured with tracemalloc on middle game positions)
+    NODE_SIZE = 6 * 1024
+    # Part of the cap the game tree keeps after releasing subtrees
+    RELEASE_RATIO = 0.5
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self, max_nodes: float = inf, max_megabytes: float = inf) -> None:
+        if max_nodes <= 0 or max_megabytes <= 0:
+            raise ValueError("The node budget must be positive")
+
+        max_nodes = min(max_nodes, max_megabytes * 1024 * 1024 // self.NODE_SIZE)
+        self.max_nodes = int(max_nodes) if max_nodes < inf else inf
+        # Number of nodes kept by the game tree
+        self.count = 0
+
+        # Statistics
+        self.peak = 0
+        self.stops = 0
+        self.released = 0
+
+    def __str__(self) -> str:
+        return "{} nodes of {}, peak {}, {} stops, {} released".format(
+            self.count, self.max_nodes, self.peak, self.stops, self.released
+        )
+
+    # Properties initialization
+    # .release_target
+    @property
+    def release_target(self) -> float:
+        """This is the Getter function of the number of nodes kept after releasing subtrees"""
+        return self.max_nodes * self.RELEASE_RATIO
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def add(self, number_of_nodes: int = 1) -> None:
+        """This method counts new nodes of the game tree"""
+        self.count += number_of_nodes
+        if self.count > self.peak:
+            self.peak = self.count
+
+    def release(self, number_of_nodes: int) -> None:
+        """This method counts released nodes of the game tree"""
+        self.count -= number_of_nodes
+        self.released += number_of_nodes
+
+    def is_exceeded(self) -> bool:
+        """This method returns True if the game tree keeps more nodes than its cap"""
+        return self.count > self.max_nodes
+
+    # [END METHODS]
+
+
+# [BEGIN CONSTANTS]
+# Default caps of the game tree of a bot, in nodes and in megabytes, which can be set
+# with the XIANGQI_MAX_NODES and XIANGQI_TREE_MB environment variables
+# (by default, only the memory is capped)
+DEFAULT_MAX_NODES = float(os.environ.get("XIANGQI_MAX_NODES", inf))
+DEFAULT_MAX_MEGABYTES = float(os.environ.get("XIANGQI_TREE_MB", 1024))
+
+# [END CONSTANTS]
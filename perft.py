@@ -0,0 +1,145 @@
+"""Module providing the perft and divide tool of the move generator:
+it counts the leaf nodes of the move tree to a given depth"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from game_state import GameState
+import board_encoding
+
+
+# [BEGIN CONSTANTS]
+# Ways of walking the move tree
+# .Create a child game state for every move (what the game trees do)
+CHILDREN_METHOD = "children"
+# .Make and unmake the moves on a single game state
+MAKE_METHOD = "make"
+METHODS = (CHILDREN_METHOD, MAKE_METHOD)
+
+BACKENDS = (GameState.MAILBOX_BACKEND, GameState.BITBOARD_BACKEND)
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def perft(game_state: GameState, depth: int, method: str = CHILDREN_METHOD) -> int:
+    """This function returns the number of leaf nodes of the move tree
+    of a game state to a depth"""
+    if depth <= 0:
+        return 1
+
+    if method == CHILDREN_METHOD:
+        return _perft_children(game_state, depth)
+    if method == MAKE_METHOD:
+        return _perft_make(game_state, depth)
+
+    raise ValueError("Perft method is not found")
+
+
+def _perft_children(game_state: GameState, depth: int) -> int:
+    """This function counts the leaf nodes with GameState.generate_all_game_states"""
+    # The leaves are created as well, so that the counts cover the creation of every child
+    if depth == 1:
+        return len(game_state.generate_all_game_states())
+
+    nodes = 0
+    for child_game_state, _ in game_state.generate_all_game_states():
+        nodes += _perft_children(child_game_state, depth - 1)
+
+    return nodes
+
+
+def _perft_make(game_state: GameState, depth: int) -> int:
+    """This function counts the leaf nodes with make_move and unmake_move"""
+    valid_moves = game_state.status.valid_moves
+    if depth == 1:
+        return len(valid_moves)
+
+    nodes = 0
+    for move in valid_moves:
+        undo = game_state.make_move(move)
+        nodes += _perft_make(game_state, depth - 1)
+        game_state.unmake_move(undo)
+
+    return nodes
+
+
+def divide(
+    game_state: GameState,
+    depth: int,
+    method: str = CHILDREN_METHOD,
+    processes: int = 1,
+    backend: str = GameState.MAILBOX_BACKEND,
+) -> list:
+    """This function returns the (move, number of leaf nodes) pairs of every
+    root move, the root moves being split across a process pool if asked"""
+    if depth <= 0:
+        return []
+
+    root_moves = [
+        (board_encoding.SQUARE_TO_POSITION[old_square], board_encoding.SQUARE_TO_POSITION[new_square])
+        for old_square, new_square in game_state.status.valid_moves
+    ]
+    tasks = [
+        (game_state.generate_game_state_with_move(*move)[0], depth - 1, method)
+        for move in root_moves
+    ]
+
+    if processes > 1:
+        with ProcessPoolExecutor(processes, initializer=_set_backend, initargs=(backend,)) as executor:
+            counts = list(executor.map(_perft_task, tasks))
+    else:
+        counts = [_perft_task(task) for task in tasks]
+
+    return list(zip(root_moves, counts))
+
+
+def _perft_task(task: tuple) -> int:
+    """This function runs perft on a (game state, depth, method) task of the process pool"""
+    return perft(*task)
+
+
+def _set_backend(backend: str) -> None:
+    """This function sets the move generator backend of the game states created from now on"""
+    if backend not in BACKENDS:
+        raise ValueError("Backend is not found")
+    GameState.BACKEND = backend
+
+
+def main() -> None:
+    """This function runs perft from the command line"""
+    parser = argparse.ArgumentParser(description="Count the leaf nodes of the move tree")
+    parser.add_argument("depth", type=int, help="depth of the move tree")
+    parser.add_argument("--fen", help="position to start from (the initial position by default)")
+    parser.add_argument("--method", choices=METHODS, default=CHILDREN_METHOD)
+    parser.add_argument("--backend", choices=BACKENDS, default=GameState.MAILBOX_BACKEND)
+    parser.add_argument("--divide", action="store_true", help="print the nodes of every root move")
+    parser.add_argument("--processes", type=int, default=1, help="split the root moves across processes")
+    args = parser.parse_args()
+
+    # The backend must be set before the game state is created
+    _set_backend(args.backend)
+    if args.fen is None:
+        game_state = GameState.generate_initial_game_state()
+    else:
+        game_state = GameState.generate_game_state_from_fen(args.fen)
+
+    start_time = time.perf_counter()
+    if args.divide or args.processes > 1:
+        move_counts = divide(game_state, args.depth, args.method, args.processes, args.backend)
+        nodes = sum(count for _, count in move_counts)
+        if args.divide:
+            for (old_pos, new_pos), count in move_counts:
+                print(old_pos, new_pos, count)
+    else:
+        nodes = perft(game_state, args.depth, args.method)
+    elapsed_time = time.perf_counter() - start_time
+
+    print("Nodes:", nodes)
+    print("Time: %.3f s" % elapsed_time)
+    print("Nodes per second: %d" % (nodes / elapsed_time if elapsed_time > 0 else 0))
+
+# [END FUNCTIONS]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""Module providing the stateless move generators and value functions of the pieces,
+working directly on a board and a square"""
+from board_encoding import (
+    EMPTY, OFFBOARD, ROW_STRIDE, TYPE_MASK, COLOUR_MASK, RED, BLACK, RIVER_SQUARE,
+    SQUARES, SQUARE_TO_POSITION, MAILBOX_SIZE,
+    GENERAL, ADVISOR, ELEPHANT, HORSE, ROOK, CANNON, PAWN,
+)
+from move_tables import (
+    ORTHOGONAL_OFFSETS, HORSE_MOVES, HORSE_ATTACKS, ELEPHANT_MOVES,
+    ADVISOR_MOVES, GENERAL_MOVES, PAWN_MOVES, PALACE_SQUARES,
+)
+
+# [BEGIN CONSTANTS]
+# Base values of the pieces
+PIECE_VALUES = {
+    GENERAL: 0,
+    ADVISOR: 20,
+    ELEPHANT: 25,
+    HORSE: 40,
+    ROOK: 90,
+    CANNON: 45,
+    PAWN: 10,
+}
+CROSSED_PAWN_VALUE = 20
+
+# [END CONSTANTS]
+
+
+# [BEGIN TABLE BUILDERS]
+def is_crossed_river(square: int, colour: int) -> bool:
+    """This function returns True if a square is across the river for a team"""
+    if colour == RED:
+        return square < RIVER_SQUARE
+    return square >= RIVER_SQUARE
+
+
+def _get_pawn_bonus_1(square: int, colour: int) -> int:
+    """This function returns the positional bonus of a pawn in the value pack 1"""
+    position = SQUARE_TO_POSITION[square]
+    x, y = position
+    if colour == BLACK:
+        if position == (3, 4):
+            return 20
+        if x == 5 or x == 6:
+            return 10
+        if x == 7 or x == 8:
+            return 20 if 1 < y < 7 else 10
+    else:
+        if position == (6, 4):
+            return 20
+        if x == 3 or x == 4:
+            return 10
+        if x == 1 or x == 2:
+            return 20 if 1 < y < 7 else 10
+    return 0
+
+
+def _get_pawn_bonus_2(square: int, colour: int) -> int:
+    """This function returns the positional bonus of a pawn in the value pack 2
+    (the bonus of the central starting square depends on the game phase, see PAWN_CENTRES)"""
+    x, y = SQUARE_TO_POSITION[square]
+    crossed = is_crossed_river(square, colour)
+    if colour == BLACK:
+        if x in range(7, 9) and y in range(2, 7):
+            return 20
+        if x in range(6, 9) and y in range(1, 8):
+            return 15
+        if crossed and x != 9:
+            return 10
+    else:
+        if x in range(1, 3) and y in range(2, 7):
+            return 20
+        if x in range(1, 4) and y in range(1, 8):
+            return 15
+        if crossed and x != 0:
+            return 10
+    return 0
+
+
+def _build_pawn_bonuses(bonus_function) -> dict:
+    """This function builds the positional bonuses of the pawns of every team on every square"""
+    tables = {}
+    for colour in (RED, BLACK):
+        table = [0] * MAILBOX_SIZE
+        for square in SQUARES:
+            table[square] = bonus_function(square, colour)
+        tables[colour] = table
+    return tables
+
+
+def _build_horse_distances(colour: int) -> list:
+    """This function builds the distance of every square to the square in front
+    of the opponent's palace, used by the value pack 2 of the horse"""
+    palace_x, palace_y = (1, 4) if colour == RED else (8, 4)
+    table = [0] * MAILBOX_SIZE
+    for square in SQUARES:
+        x, y = SQUARE_TO_POSITION[square]
+        table[square] = abs(palace_x - x) + abs(palace_y - y)
+    return table
+
+
+# [END TABLE BUILDERS]
+
+# [BEGIN TABLES]
+PAWN_BONUSES_1 = _build_pawn_bonuses(_get_pawn_bonus_1)
+PAWN_BONUSES_2 = _build_pawn_bonuses(_get_pawn_bonus_2)
+# Central starting square of the pawns, whose bonus fades with the game phase
+PAWN_CENTRES = {RED: (6 + 2) * ROW_STRIDE + 4, BLACK: (3 + 2) * ROW_STRIDE + 4}
+HORSE_DISTANCES = {RED: _build_horse_distances(RED), BLACK: _build_horse_distances(BLACK)}
+# Square of the own horse that blocks the general, penalised by the value pack 1
+HORSE_BLOCKING_SQUARES = {RED: (8 + 2) * ROW_STRIDE + 4, BLACK: (1 + 2) * ROW_STRIDE + 4}
+# [END TABLES]
+
+
+# [BEGIN MOVE GENERATORS]
+def get_advisor_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of an advisor"""
+    # Iterate through all diagonal squares in the palace
+    return [goal for goal in ADVISOR_MOVES[square] if not board[goal] & colour]
+
+
+def get_cannon_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of a cannon"""
+    admissible_moves = []
+
+    # Iterate through direction
+    for offset in ORTHOGONAL_OFFSETS:
+        # Move along the empty squares until the first piece (the screen)
+        goal = square + offset
+        while board[goal] == EMPTY:
+            admissible_moves.append(goal)
+            goal += offset
+
+        # Stop at the edge of the board
+        if board[goal] == OFFBOARD:
+            continue
+
+        # Jump over the screen to the next piece
+        goal += offset
+        while board[goal] == EMPTY:
+            goal += offset
+
+        # If there is an enemy piece behind the screen, it can be captured
+        if not board[goal] & colour:
+            admissible_moves.append(goal)
+
+    return admissible_moves
+
+
+def get_rook_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of a rook"""
+    admissible_moves = []
+
+    # Iterate through direction
+    for offset in ORTHOGONAL_OFFSETS:
+        # Move along the empty squares
+        goal = square + offset
+        while board[goal] == EMPTY:
+            admissible_moves.append(goal)
+            goal += offset
+
+        # Check if the piece on the square is on the enemy team
+        # (the sentinel carries the own colour bit)
+        if not board[goal] & colour:
+            admissible_moves.append(goal)
+
+    return admissible_moves
+
+
+def get_elephant_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of an elephant"""
+    # Check if the eye is free and the goal is not taken by a teammate
+    return [
+        goal
+        for goal, eye in ELEPHANT_MOVES[colour][square]
+        if board[eye] == EMPTY and not board[goal] & colour
+    ]
+
+
+def get_general_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of a general"""
+    # Iterate through the orthogonal squares in the palace
+    return [goal for goal in GENERAL_MOVES[square] if not board[goal] & colour]
+
+
+def get_pawn_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of a pawn"""
+    # Check the forward square, and the side squares once the river is crossed
+    return [goal for goal in PAWN_MOVES[colour][square] if not board[goal] & colour]
+
+
+def get_horse_moves(board: list, square: int, colour: int) -> list:
+    """This function returns the admissible target squares of a horse"""
+    # Check if the horse is not blocked at its leg and the goal square is not a teammate
+    return [
+        goal
+        for goal, leg in HORSE_MOVES[square]
+        if board[leg] == EMPTY and not board[goal] & colour
+    ]
+
+
+def count_rook_control(board: list, square: int) -> int:
+    """This function returns the number of empty squares a rook controls"""
+    count = 0
+    for offset in ORTHOGONAL_OFFSETS:
+        goal = square + offset
+        while board[goal] == EMPTY:
+            count += 1
+            goal += offset
+    return count
+
+
+def is_general_exposed(board: list, colour: int, general_square: int = None) -> bool:
+    """This function returns True if the general of a team is exposed
+    (the square of the general is searched in its palace if it is not given)"""
+    # Find the square of the General in its palace
+    if general_square is None:
+        for square in PALACE_SQUARES[colour]:
+            if board[square] == colour | GENERAL:
+                general_square = square
+
+    # Codes of the opponent's attacking pieces
+    opponent_colour = colour ^ COLOUR_MASK
+    opponent_rook = opponent_colour | ROOK
+    opponent_horse = opponent_colour | HORSE
+    opponent_cannon = opponent_colour | CANNON
+    opponent_pawn = opponent_colour | PAWN
+    # Direction of the opponent's side
+    forward = -ROW_STRIDE if colour == RED else ROW_STRIDE
+
+    # .Check the rook
+    for offset in ORTHOGONAL_OFFSETS:
+        square = general_square + offset
+        while board[square] == EMPTY:
+            square += offset
+        # If the enemy's rook is the first piece on the line then return True
+        if board[square] == opponent_rook:
+            return True
+
+    # .Check the horse
+    for horse_square, leg_square in HORSE_ATTACKS[general_square]:
+        # If the opponent horse is on the check square and its leg is free then return True
+        if board[horse_square] == opponent_horse and board[leg_square] == EMPTY:
+            return True
+
+    # .Check the cannon
+    for offset in ORTHOGONAL_OFFSETS:
+        square = general_square + offset
+        while board[square] == EMPTY:
+            square += offset
+        # If there is no screen on the line then continue
+        if board[square] == OFFBOARD:
+            continue
+
+        # If the enemy's cannon is the first piece behind the screen, then return True
+        square += offset
+        while board[square] == EMPTY:
+            square += offset
+        if board[square] == opponent_cannon:
+            return True
+
+    # .Check the pawn on the left, right and forward squares
+    if (
+        board[general_square + 1] == opponent_pawn
+        or board[general_square - 1] == opponent_pawn
+        or board[general_square + forward] == opponent_pawn
+    ):
+        return True
+
+    # .Check the general
+    square = general_square + forward
+    while board[square] == EMPTY:
+        square += forward
+    # If the first piece is opponent's general then return True
+    return board[square] & TYPE_MASK == GENERAL
+
+
+# [END MOVE GENERATORS]
+
+
+# [BEGIN VALUE TERMS]
+# The value of a piece is split into static terms and a dynamic change.
+# The static terms (a, b, c) of a piece on a square give a + b * N + c * n, where N is
+# the number of pieces and n the number of team pieces; they only depend on the
+# square, so they are compiled into tables (see VALUE_TABLES).
+# The dynamic change takes (board, square, colour, mobility) and depends on the other
+# pieces. The mobility is the number of admissible moves of the piece, or None if
+# it has to be computed.
+def _get_mobility(board: list, square: int, colour: int, mobility: int) -> int:
+    """This function returns the given mobility, or computes it from the move generator"""
+    if mobility is None:
+        mobility = len(MOVE_GENERATORS[board[square] & TYPE_MASK](board, square, colour))
+    return mobility
+
+
+def _get_base_terms(piece_type: int, square: int, colour: int) -> tuple:
+    """Default value pack of every piece but the pawn: the base value"""
+    return PIECE_VALUES[piece_type], 0, 0
+
+
+def _get_pawn_terms_0(piece_type: int, square: int, colour: int) -> tuple:
+    """Default value pack of the pawn: the value doubles once the river is crossed"""
+    if is_crossed_river(square, colour):
+        return CROSSED_PAWN_VALUE, 0, 0
+    return PIECE_VALUES[PAWN], 0, 0
+
+
+def _get_horse_terms_1(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 1 of the horse: a penalty of 25 points if it blocks the general"""
+    if square == HORSE_BLOCKING_SQUARES[colour]:
+        return PIECE_VALUES[HORSE] - 25, 0, 0
+    return PIECE_VALUES[HORSE], 0, 0
+
+
+def _get_pawn_terms_1(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 1 of the pawn: a bonus based on the position of the pawn"""
+    return PIECE_VALUES[PAWN] + PAWN_BONUSES_1[colour][square], 0, 0
+
+
+def _get_cannon_terms_2(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 2 of the cannon: a bonus or penalty based on the game phase,
+    (N - 16) * 0.75, and against trading when losing, (16 - n) * 0.25"""
+    return PIECE_VALUES[CANNON] - 16 * 0.75 + 16 * 0.25, 0.75, -0.25
+
+
+def _get_rook_terms_2(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 2 of the rook: against trading when losing, (16 - n) * 0.25,
+    and a bonus based on the game phase once the river is crossed, (32 - N)"""
+    crossed = int(is_crossed_river(square, colour))
+    return PIECE_VALUES[ROOK] + 16 * 0.25 + 32 * crossed, -crossed, -0.25
+
+
+def _get_pawn_terms_2(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 2 of the pawn: a bonus based on the position of the pawn
+    (fading with the game phase on the central starting square, 20 - (32 - N) * 2)
+    and on the game phase, (16 - n) * 2"""
+    if square == PAWN_CENTRES[colour]:
+        return PIECE_VALUES[PAWN] + 20 - 32 * 2 + 16 * 2, 2, -2
+    return PIECE_VALUES[PAWN] + PAWN_BONUSES_2[colour][square] + 16 * 2, 0, -2
+
+
+def _get_horse_terms_2(piece_type: int, square: int, colour: int) -> tuple:
+    """Value pack 2 of the horse: a bonus or penalty based on the state of the game,
+    (22 - N) * 0.75, and when getting close to the opponent's palace,
+    (32 - N) * 0.15 * (5 - distance)"""
+    closeness = 5 - HORSE_DISTANCES[colour][square]
+    return (
+        PIECE_VALUES[HORSE] + 22 * 0.75 + 32 * 0.15 * closeness,
+        -0.75 - 0.15 * closeness,
+        0,
+    )
+
+
+def _get_immobile_penalty(board, square, colour, mobility):
+    """A penalty of 10 points if the piece has no admissible moves"""
+    if _get_mobility(board, square, colour, mobility) == 0:
+        return -10
+    return 0
+
+
+def _get_rook_change(board, square, colour, mobility):
+    """Value packs 1 and 2 of the rook"""
+    # Receive a penalty of 10 points if the rook has no admissible moves
+    if _get_mobility(board, square, colour, mobility) == 0:
+        return -10
+    # Receive a bonus based on the number of positions the rook controls
+    return count_rook_control(board, square) * 0.5
+
+
+def _get_advisor_change_2(board, square, colour, mobility):
+    """Value pack 2 of the advisor"""
+    change = 0
+    for goal in ADVISOR_MOVES[square]:
+        # If the 2 advisors are connected, they receive a bonus of 5 points
+        if board[goal] & TYPE_MASK == ADVISOR:
+            change += 5
+    return change
+
+
+def _get_elephant_change_2(board, square, colour, mobility):
+    """Value pack 2 of the elephant"""
+    # The table only holds the goals on the own side of the river
+    for goal, eye in ELEPHANT_MOVES[colour][square]:
+        # Receive a bonus if the 2 elephants are connected
+        if board[eye] == EMPTY and board[goal] & TYPE_MASK == ELEPHANT:
+            return 5
+    return 0
+
+
+def _get_general_change_2(board, square, colour, mobility):
+    """Value pack 2 of the general"""
+    change = 0
+    # Receive a penalty of 10 points if the general has no admissible moves
+    if _get_mobility(board, square, colour, mobility) == 0:
+        change += -10
+    # Receive a penalty of 15 points if the general is exposed
+    if is_general_exposed(board, colour, square) is True:
+        change += -15
+    return change
+
+
+def _get_horse_change_1(board, square, colour, mobility):
+    """Value pack 1 of the horse"""
+    # Receive bonus or penalty based on the number of admissible moves it has
+    mobility = _get_mobility(board, square, colour, mobility)
+    if mobility == 0 or mobility == 1:
+        return -10
+    if mobility == 2:
+        return -5
+    if mobility == 5 or mobility == 6:
+        return 5
+    if mobility == 7 or mobility == 8:
+        return 10
+    return 0
+
+
+def _get_horse_change_2(board, square, colour, mobility):
+    """Value pack 2 of the horse"""
+    # Receive a bonus or penalty based on the number of admissible moves it has
+    mobility = _get_mobility(board, square, colour, mobility)
+    if mobility == 0 or mobility == 1:
+        return -5
+    if mobility == 2:
+        return -2.5
+    if mobility == 5 or mobility == 6:
+        return 2.5
+    if mobility == 7 or mobility == 8:
+        return 5
+    return 0
+
+
+# [END VALUE TERMS]
+
+# [BEGIN DISPATCH TABLES]
+# Move generator of every piece type
+MOVE_GENERATORS = [None] * (TYPE_MASK + 1)
+MOVE_GENERATORS[GENERAL] = get_general_moves
+MOVE_GENERATORS[ADVISOR] = get_advisor_moves
+MOVE_GENERATORS[ELEPHANT] = get_elephant_moves
+MOVE_GENERATORS[HORSE] = get_horse_moves
+MOVE_GENERATORS[ROOK] = get_rook_moves
+MOVE_GENERATORS[CANNON] = get_cannon_moves
+MOVE_GENERATORS[PAWN] = get_pawn_moves
+
+# Static terms of every piece type, one function for every value pack
+TERM_FUNCTIONS = [None] * (TYPE_MASK + 1)
+TERM_FUNCTIONS[GENERAL] = (_get_base_terms, _get_base_terms, _get_base_terms)
+TERM_FUNCTIONS[ADVISOR] = (_get_base_terms, _get_base_terms, _get_base_terms)
+TERM_FUNCTIONS[ELEPHANT] = (_get_base_terms, _get_base_terms, _get_base_terms)
+TERM_FUNCTIONS[HORSE] = (_get_base_terms, _get_horse_terms_1, _get_horse_terms_2)
+TERM_FUNCTIONS[ROOK] = (_get_base_terms, _get_base_terms, _get_rook_terms_2)
+TERM_FUNCTIONS[CANNON] = (_get_base_terms, _get_base_terms, _get_cannon_terms_2)
+TERM_FUNCTIONS[PAWN] = (_get_pawn_terms_0, _get_pawn_terms_1, _get_pawn_terms_2)
+
+# Dynamic change of every piece type, one function (or None) for every value pack
+CHANGE_FUNCTIONS = [None] * (TYPE_MASK + 1)
+CHANGE_FUNCTIONS[GENERAL] = (None, None, _get_general_change_2)
+CHANGE_FUNCTIONS[ADVISOR] = (None, _get_immobile_penalty, _get_advisor_change_2)
+CHANGE_FUNCTIONS[ELEPHANT] = (None, _get_immobile_penalty, _get_elephant_change_2)
+CHANGE_FUNCTIONS[HORSE] = (None, _get_horse_change_1, _get_horse_change_2)
+CHANGE_FUNCTIONS[ROOK] = (None, _get_rook_change, _get_rook_change)
+CHANGE_FUNCTIONS[CANNON] = (None, _get_immobile_penalty, _get_immobile_penalty)
+CHANGE_FUNCTIONS[PAWN] = (None, None, None)
+# [END DISPATCH TABLES]
+
+
+# [BEGIN COMPILED TABLES]
+NUMBER_OF_VALUE_PACKS = 3
+# The static terms are stored as integers in 1/20 of a point,
+# so that they can be added and subtracted without rounding errors
+VALUE_SCALE = 20
+
+
+def _compile_value_tables(value_pack: int) -> list:
+    """This function compiles the static terms of every piece code on every square
+    in a value pack, scaled by VALUE_SCALE"""
+    tables = [None] * (COLOUR_MASK + 1)
+    for colour in (RED, BLACK):
+        for piece_type in (GENERAL, ADVISOR, ELEPHANT, HORSE, ROOK, CANNON, PAWN):
+            term_function = TERM_FUNCTIONS[piece_type][value_pack]
+            table = [(0, 0, 0)] * MAILBOX_SIZE
+            for square in SQUARES:
+                table[square] = tuple(
+                    round(term * VALUE_SCALE) for term in term_function(piece_type, square, colour)
+                )
+            tables[colour | piece_type] = table
+    return tables
+
+
+# Static terms (a, b, c) of every piece code on every square, one table for every value pack
+VALUE_TABLES = tuple(_compile_value_tables(value_pack) for value_pack in range(NUMBER_OF_VALUE_PACKS))
+# Dynamic change of every piece type, one list for every value pack
+CHANGE_TABLES = tuple(
+    [None if functions is None else functions[value_pack] for functions in CHANGE_FUNCTIONS]
+    for value_pack in range(NUMBER_OF_VALUE_PACKS)
+)
+# [END COMPILED TABLES]
+
+
+# [BEGIN FUNCTIONS]
+def get_piece_moves(board: list, square: int) -> list:
+    """This function returns the admissible target squares of the piece on a square"""
+    code = board[square]
+    return MOVE_GENERATORS[code & TYPE_MASK](board, square, code & COLOUR_MASK)
+
+
+def get_piece_value(
+    board: list,
+    square: int,
+    value_pack: int,
+    number_of_pieces: int,
+    number_of_team_pieces: int,
+    mobility: int = None,
+) -> float:
+    """This function returns the value of the piece on a square in a value pack"""
+    if not 0 <= value_pack < NUMBER_OF_VALUE_PACKS:
+        raise ValueError("Value pack is not found")
+
+    code = board[square]
+    a, b, c = VALUE_TABLES[value_pack][code][square]
+    value = (a + b * number_of_pieces + c * number_of_team_pieces) / VALUE_SCALE
+
+    change_function = CHANGE_TABLES[value_pack][code & TYPE_MASK]
+    if change_function is not None:
+        value += change_function(board, square, code & COLOUR_MASK, mobility)
+    return value
+
+
+# [END FUNCTIONS]
@@ -0,0 +1,53 @@
+"""Module providing the status of a position, computed once by a single move generation pass"""
+from team import Team
+
+
+class PositionStatus:
+    """This class holds what a move generation pass knows about a position:
+    the legal moves, the valid moves (legal and not perpetual), the check,
+    the winner and the number of admissible moves of every piece"""
+
+    __slots__ = ("legal_moves", "valid_moves", "is_in_check", "winner", "mobility")
+
+    # [BEGIN INITIALIZATION]
+    def __init__(
+        self,
+        legal_moves: list,
+        valid_moves: list,
+        is_in_check: bool,
+        winner: Team,
+        mobility: dict,
+    ) -> None:
+        # Moves (pairs of mailbox squares) of the team to move that do not expose its general
+        self.legal_moves = legal_moves
+        # Legal moves that do not repeat the position too many times
+        self.valid_moves = valid_moves
+        self.is_in_check = is_in_check
+        # Team.NONE, or the opponent if the team to move has no legal move
+        self.winner = winner
+        # Number of admissible moves (exposing moves included) of the pieces
+        # of the team to move, keyed by square
+        self.mobility = mobility
+
+    # [END INITIALIZATION]
+
+    # Properties initialization
+    # .is_terminal
+    @property
+    def is_terminal(self) -> bool:
+        """This is the Getter function of the terminal flag,
+        return True if the team to move has no legal move"""
+        return len(self.legal_moves) == 0
+
+    # .is_checkmate
+    @property
+    def is_checkmate(self) -> bool:
+        """This is the Getter function of the checkmate flag"""
+        return self.is_in_check and self.is_terminal
+
+    # .is_stalemate
+    @property
+    def is_stalemate(self) -> bool:
+        """This is the Getter function of the stalemate flag
+        (in Chinese chess, the team without a legal move loses as well)"""
+        return not self.is_in_check and self.is_terminal
@@ -0,0 +1,99 @@
+"""Module providing the quiescence search, which resolves the captures
+(and optionally the checks) left at the horizon of a search"""
+import os
+from math import inf
+from board_encoding import EMPTY, TYPE_MASK
+from piece_rules import PIECE_VALUES
+from move_ordering import get_mvv_lva_key
+
+# [BEGIN CONSTANTS]
+# Maximum number of plies of the quiescence search
+MAX_QUIESCENCE_PLY = 8
+# Number of plies in which the moves giving check are searched as well
+CHECK_PLY = 1
+# Margin added to the value of the captured piece by the delta pruning
+# (covers the positional bonuses a capture can gain)
+DELTA_MARGIN = 20
+
+# Default quiescence search of the minimax bots: "off", "captures" or "checks"
+# (captures and checks), which can be set with the XIANGQI_QUIESCENCE environment variable
+QUIESCENCE_MODES = ("off", "captures", "checks")
+DEFAULT_MODE = os.environ.get("XIANGQI_QUIESCENCE", "off")
+if DEFAULT_MODE not in QUIESCENCE_MODES:
+    raise ValueError("Quiescence mode must be one of {}".format(", ".join(QUIESCENCE_MODES)))
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def quiescence_search(
+    game_state,
+    alpha: float,
+    beta: float,
+    include_checks: bool = False,
+    search_context=None,
+    ply: int = 0,
+) -> float:
+    """This function returns the value of a position, from the point of view of the
+    team to move, once the captures (and the checks in the first plies if asked) are
+    resolved. The moves are made on the game state and taken back before returning"""
+    if search_context is not None:
+        search_context.nodes += 1
+
+    # 1 if the red team is to move, -1 otherwise
+    sign = game_state._current_team.value
+    status = game_state.status
+    stand_pat = sign * game_state.value
+
+    # The game is over, or the search is deep enough
+    if status.is_terminal or ply >= MAX_QUIESCENCE_PLY:
+        return stand_pat
+
+    board = game_state.board
+    if status.is_in_check:
+        # In check, the team to move cannot stand pat: every evasion is searched
+        best_value = -inf
+        moves = status.valid_moves
+    else:
+        # Stand pat: the team to move can keep the static value by playing a quiet move
+        best_value = stand_pat
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        # .Captures by MVV-LVA, without the ones that cannot raise alpha (delta pruning);
+        # the value of a pruned capture is bounded by its optimistic value
+        moves = []
+        for move in status.valid_moves:
+            if board[move[1]] == EMPTY:
+                continue
+
+            optimistic_value = stand_pat + PIECE_VALUES[board[move[1]] & TYPE_MASK] + DELTA_MARGIN
+            if optimistic_value > alpha:
+                moves.append(move)
+            elif optimistic_value > best_value:
+                best_value = optimistic_value
+        moves.sort(key=lambda move: get_mvv_lva_key(board, move))
+
+        # .Quiet moves giving check
+        if include_checks and ply < CHECK_PLY:
+            for move in status.valid_moves:
+                if board[move[1]] == EMPTY and game_state.is_move_giving_check(move):
+                    moves.append(move)
+
+    for move in moves:
+        undo = game_state.make_move(move)
+        value = -quiescence_search(game_state, -beta, -alpha, include_checks, search_context, ply + 1)
+        game_state.unmake_move(undo)
+
+        if value > best_value:
+            best_value = value
+        if value > alpha:
+            alpha = value
+        if alpha >= beta:
+            break
+
+    return best_value
+
+
+# [END FUNCTIONS]
@@ -0,0 +1,67 @@
+"""Module providing the repetition stack shared by the game states of a search path"""
+
+
+class RepetitionStack:
+    """This class represents the top of a persistent stack of Zobrist keys.
+    Pushing a key creates a new top that shares the rest of the stack, so a
+    child game state costs O(1) instead of a copy of the whole history, and
+    siblings share their common path"""
+
+    __slots__ = ("key", "parent", "reversible_count")
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self, key: int, parent=None, is_irreversible: bool = True) -> None:
+        self.key = key
+        self.parent = parent
+
+        # Number of entries below this one since the last irreversible move
+        # (no position before an irreversible move can be repeated)
+        if is_irreversible or parent is None:
+            self.reversible_count = 0
+        else:
+            self.reversible_count = parent.reversible_count + 1
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def push(self, key: int, is_irreversible: bool):
+        """This method returns a new top of the stack with the key on it"""
+        return RepetitionStack(key, self, is_irreversible)
+
+    def count(self) -> int:
+        """This method returns how many times the key on the top has been seen
+        since the last irreversible move (the top itself included)"""
+        key = self.key
+        count = 1
+        entry = self
+        remaining = self.reversible_count
+
+        # The keys include the side to move, so only every second entry can match
+        while remaining >= 2:
+            entry = entry.parent.parent
+            remaining -= 2
+            if entry.key == key:
+                count += 1
+
+        return count
+
+    def count_after_push(self, key: int, is_irreversible: bool) -> int:
+        """This method returns what count() would return after pushing a key,
+        without creating the new entry"""
+        if is_irreversible or self.reversible_count == 0:
+            return 1
+
+        # The new entry would be above this one, so the first candidate is the parent
+        entry = self.parent
+        remaining = self.reversible_count - 1
+        count = 2 if entry.key == key else 1
+
+        while remaining >= 2:
+            entry = entry.parent.parent
+            remaining -= 2
+            if entry.key == key:
+                count += 1
+
+        return count
+
+    # [END METHODS]
@@ -0,0 +1,100 @@
+"""Module providing the state shared by the nodes of a minimax search"""
+import os
+from time import time
+from transposition_table import TranspositionTable
+from move_ordering import MoveOrdering
+from node_budget import NodeBudget
+
+
+class SearchStopped(Exception):
+    """This exception is raised when a search runs out of time or exceeds its node budget"""
+
+
+class SearchContext:
+    """This class holds what the nodes of one search share: the transposition
+    table, the deadline, the node budget of the game tree, the search options (depth-first mode, quiescence and selective
+    search), the move ordering (killer moves and history table) and the node counter"""
+
+    # [BEGIN CONSTANTS]
+    # Number of nodes between two checks of the clock
+    TIME_CHECK_INTERVAL = 8
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+    def __init__(
+        self,
+        transposition_table: TranspositionTable = None,
+        deadline: float = None,
+        quiescence: bool = False,
+        quiescence_checks: bool = False,
+        null_move: bool = False,
+        late_move_reductions: bool = False,
+        futility: bool = False,
+        depth_first: bool = False,
+        node_budget: NodeBudget = None,
+    ) -> None:
+        self.transposition_table = transposition_table
+        # Time (as returned by time.time) at which the search must stop, None for no limit
+        self.deadline = deadline
+        # Resolve the captures (and the checks if asked) at the target depth (see quiescence.py)
+        self.quiescence = quiescence
+        self.quiescence_checks = quiescence_checks
+        # Selective search: null-move pruning, late move reductions,
+        # and futility pruning and razoring at the frontier nodes
+        self.null_move = null_move
+        self.late_move_reductions = late_move_reductions
+        self.futility = futility
+        # Search below the children of the root on a single position, without child nodes
+        self.depth_first = depth_first
+        # Node budget of the game tree, None for no cap (see node_budget.py)
+        self.node_budget = node_budget
+        # Killer moves and history table, kept across the iterations of a search
+        self.move_ordering = MoveOrdering()
+
+        # Statistics
+        self.nodes = 0
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def count_node(self) -> None:
+        """This method counts a visited node, and raises SearchStopped if the game tree
+        exceeds its node budget or if the deadline has passed (the clock is checked
+        every few nodes)"""
+        self.nodes += 1
+        if self.node_budget is not None and self.node_budget.is_exceeded():
+            self.node_budget.stops += 1
+            raise SearchStopped()
+        if (
+            self.deadline is not None
+            and self.nodes % self.TIME_CHECK_INTERVAL == 0
+            and time() >= self.deadline
+        ):
+            raise SearchStopped()
+
+    def is_time_up(self) -> bool:
+        """This method returns True if the deadline has passed"""
+        return self.deadline is not None and time() >= self.deadline
+
+    # [END METHODS]
+
+
+# [BEGIN CONSTANTS]
+# Options of the selective search
+SELECTIVE_SEARCH_OPTIONS = ("null_move", "late_move_reductions", "futility")
+
+# Default selective search options of the minimax bots, which can be set with the
+# XIANGQI_SELECTIVE_SEARCH environment variable (comma-separated, e.g. "null_move,futility")
+DEFAULT_SELECTIVE_SEARCH = tuple(
+    option.strip() for option in os.environ.get("XIANGQI_SELECTIVE_SEARCH", "").split(",") if option.strip()
+)
+for _option in DEFAULT_SELECTIVE_SEARCH:
+    if _option not in SELECTIVE_SEARCH_OPTIONS:
+        raise ValueError("Selective search option must be one of {}".format(", ".join(SELECTIVE_SEARCH_OPTIONS)))
+
+# Default search mode of the minimax bots, depth-first if the XIANGQI_DEPTH_FIRST
+# environment variable is 1 (see SearchContext)
+DEFAULT_DEPTH_FIRST = os.environ.get("XIANGQI_DEPTH_FIRST", "0") == "1"
+
+# [END CONSTANTS]
@@ -0,0 +1,71 @@
+"""Module providing the time-to-depth benchmark of the root drivers of the
+time-controlled minimax bots: full window, aspiration windows and MTD(f)"""
+import argparse
+from game_state import GameState
+from game_tree import GameTreeTimedMinimax, GameTreeAspirationMinimax, GameTreeMTDF
+from node import NodeMinimax
+from eval_cache import EVALUATION_CACHE
+
+
+# [BEGIN CONSTANTS]
+# Root drivers by name
+DRIVERS = {
+    "full": GameTreeTimedMinimax,
+    "aspiration": GameTreeAspirationMinimax,
+    "mtdf": GameTreeMTDF,
+}
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def time_to_depth(game_state: GameState, driver: str, depth: int, value_pack: int = 0) -> list:
+    """This function searches a game state with a root driver to a depth
+    and returns the time spent to complete every depth"""
+    bot = DRIVERS[driver](game_state._current_team, None, value_pack)
+    bot.target_depth = depth
+    bot.transposition_table.new_search()
+    bot.iterative_deepening(NodeMinimax(game_state, None, None), None)
+    return bot.depth_times
+
+
+def main() -> None:
+    """This function runs the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Measure the time to depth of the root drivers")
+    parser.add_argument("depth", type=int, help="depth of the searches")
+    parser.add_argument("--fen", action="append", help="position to search (repeatable)")
+    parser.add_argument("--file", help="file of positions to search, one FEN string per line")
+    parser.add_argument("--driver", action="append", choices=DRIVERS, help="root driver (all by default)")
+    parser.add_argument("--value-pack", type=int, default=0)
+    args = parser.parse_args()
+
+    fens = list(args.fen or [])
+    if args.file is not None:
+        with open(args.file, encoding="utf-8") as file:
+            fens += [line.strip() for line in file if line.strip()]
+
+    drivers = args.driver or list(DRIVERS)
+    totals = {driver: [0.0] * args.depth for driver in drivers}
+    for fen in fens or [None]:
+        print(fen or "Initial position")
+        for driver in drivers:
+            # Every driver searches a fresh game state, without the evaluations cached by the others
+            EVALUATION_CACHE.clear()
+            if fen is None:
+                game_state = GameState.generate_initial_game_state(args.value_pack)
+            else:
+                game_state = GameState.generate_game_state_from_fen(fen, args.value_pack)
+            depth_times = time_to_depth(game_state, driver, args.depth, args.value_pack)
+            print("  %-10s %s" % (driver, " ".join("%.3f" % depth_time for depth_time in depth_times)))
+            for index, depth_time in enumerate(depth_times):
+                totals[driver][index] += depth_time
+
+    print("Total")
+    for driver in drivers:
+        print("  %-10s %s" % (driver, " ".join("%.3f" % depth_time for depth_time in totals[driver])))
+
+# [END FUNCTIONS]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Module providing the fixed-size transposition table of the minimax searches"""
+import os
+from array import array
+from board_encoding import MAILBOX_SIZE, to_square, SQUARE_TO_POSITION
+
+
+class TranspositionTable:
+    """This class represents a transposition table stored in preallocated arrays.
+    The entries are grouped in buckets of BUCKET_SIZE slots; a new position replaces
+    the entry of an older search first, and then the shallowest entry of its bucket"""
+
+    # [BEGIN CONSTANTS]
+    # Bound types of the stored scores
+    EXACT = 1
+    LOWER_BOUND = 2
+    UPPER_BOUND = 3
+
+    BUCKET_SIZE = 4
+    # Memory of an entry in bytes: key (8), score (8), depth (1), bound (1), move (2) and age (2)
+    ENTRY_SIZE = 22
+    # Ages wrap around at this value
+    MAX_AGE = 1 << 16
+
+    # [END CONSTANTS]
+
+    # [BEGIN INITIALIZATION]
+    def __init__(self, max_megabytes: float) -> None:
+        if max_megabytes <= 0:
+            raise ValueError("The size of the transposition table must be positive")
+
+        self.max_megabytes = max_megabytes
+        self.number_of_buckets = max(1, int(max_megabytes * 1024 * 1024) // (self.ENTRY_SIZE * self.BUCKET_SIZE))
+        size = self.number_of_buckets * self.BUCKET_SIZE
+
+        # Preallocated arrays of the entries (a bound of 0 marks an empty slot)
+        self._keys = array("Q", bytes(8 * size))
+        self._scores = array("d", bytes(8 * size))
+        self._depths = array("b", bytes(size))
+        self._bounds = array("b", bytes(size))
+        self._moves = array("H", bytes(2 * size))
+        self._ages = array("H", bytes(2 * size))
+
+        # Age of the current search
+        self.age = 0
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __str__(self) -> str:
+        return "{} probes, {} hits, {} stores, {} overwrites, hit rate {:.1%}".format(
+            self.probes, self.hits, self.stores, self.overwrites, self.hit_rate
+        )
+
+    # Properties initialization
+    # .hit_rate
+    @property
+    def hit_rate(self) -> float:
+        """This is the Getter function of the ratio of the probes that hit"""
+        return self.hits / self.probes if self.probes > 0 else 0.0
+
+    # .statistics
+    @property
+    def statistics(self) -> dict:
+        """This is the Getter function of the counters of the table"""
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hit_rate,
+        }
+
+    # [END INITIALIZATION]
+
+    # [BEGIN METHODS]
+    def probe(self, zobrist_key: int) -> tuple:
+        """This method returns the (depth, score, bound, move) entry of a position,
+        or None if it is not stored"""
+        self.probes += 1
+        keys = self._keys
+        start = (zobrist_key % self.number_of_buckets) * self.BUCKET_SIZE
+        for slot in range(start, start + self.BUCKET_SIZE):
+            if keys[slot] == zobrist_key and self._bounds[slot] != 0:
+                self.hits += 1
+                return (
+                    self._depths[slot],
+                    self._scores[slot],
+                    self._bounds[slot],
+                    self._unpack_move(self._moves[slot]),
+                )
+
+        return None
+
+    def store(self, zobrist_key: int, depth: int, score: float, bound: int, move: tuple = None) -> None:
+        """This method stores the result of the search of a position
+        (the move is the best move found, as a pair of board positions)"""
+        keys = self._keys
+        depths = self._depths
+        ages = self._ages
+        start = (zobrist_key % self.number_of_buckets) * self.BUCKET_SIZE
+
+        # Find the slot of the position, or the slot to replace
+        replaced_slot = None
+        replaced_priority = None
+        for slot in range(start, start + self.BUCKET_SIZE):
+            if keys[slot] == zobrist_key or self._bounds[slot] == 0:
+                replaced_slot = slot
+                break
+
+            # Entries of older searches go first, then the shallowest entries
+            priority = (ages[slot] == self.age, depths[slot])
+            if replaced_priority is None or priority < replaced_priority:
+                replaced_slot, replaced_priority = slot, priority
+
+        slot = replaced_slot
+        if keys[slot] == zobrist_key and self._bounds[slot] != 0:
+            # Keep the best move of a previous search if there is none
+            if move is None:
+                move = self._unpack_move(self._moves[slot])
+        elif self._bounds[slot] != 0:
+            self.overwrites += 1
+
+        self.stores += 1
+        keys[slot] = zobrist_key
+        self._scores[slot] = score
+        depths[slot] = min(depth, 127)
+        self._bounds[slot] = bound
+        self._moves[slot] = self._pack_move(move)
+        ages[slot] = self.age
+
+    def new_search(self) -> None:
+        """This method starts a new search: the entries of the previous searches
+        are kept, but they are replaced first"""
+        self.age = (self.age + 1) % self.MAX_AGE
+
+    def clear(self) -> None:
+        """This method removes every entry and resets the statistics"""
+        size = len(self._keys)
+        self._bounds = array("b", bytes(size))
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    # Static method
+    @staticmethod
+    def _pack_move(move: tuple) -> int:
+        """This method packs a move (a pair of board positions) into an integer, 0 if there is none"""
+        if move is None:
+            return 0
+        return to_square(move[0]) * MAILBOX_SIZE + to_square(move[1])
+
+    @staticmethod
+    def _unpack_move(packed_move: int) -> tuple:
+        """This method unpacks a move packed by _pack_move"""
+        if packed_move == 0:
+            return None
+        return (
+            SQUARE_TO_POSITION[packed_move // MAILBOX_SIZE],
+            SQUARE_TO_POSITION[packed_move % MAILBOX_SIZE],
+        )
+
+    # [END METHODS]
+
+
+# [BEGIN CONSTANTS]
+# Default size of the transposition table of a bot in megabytes,
+# which can be set with the XIANGQI_TT_MB environment variable
+DEFAULT_MAX_MEGABYTES = float(os.environ.get("XIANGQI_TT_MB", 32))
+
+# [END CONSTANTS]
@@ -0,0 +1,186 @@
+"""Module providing the verification of the move generators and of the batch
+evaluation on a fixed corpus of positions (positions.fen, one FEN string per line),
+and of the perft counts of the initial position. It is run from the command line and exits with an error
+if a check fails"""
+import argparse
+import os
+import sys
+from game_state import GameState
+from perft import perft, MAKE_METHOD, METHODS, BACKENDS
+from eval_cache import EVALUATION_CACHE
+from piece_rules import NUMBER_OF_VALUE_PACKS
+import board_encoding
+import bitboard
+import batch_evaluation
+import evaluation
+
+
+# [BEGIN CONSTANTS]
+# Corpus of positions of the checks
+POSITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "positions.fen")
+# Deepest perft compared between the move generator backends
+PERFT_DEPTH = 3
+# Perft counts of the initial position at depths 1, 2 and 3
+INITIAL_PERFT_COUNTS = (44, 1920, 79666)
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def load_positions(file_name: str = POSITIONS_FILE) -> list:
+    """This function returns the FEN strings of a file of positions, one per line"""
+    with open(file_name, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def _create_game_state(fen: str, backend: str) -> GameState:
+    """This function creates the game state of a FEN string (the initial position if None)
+    with a move generator backend"""
+    previous_backend = GameState.BACKEND
+    GameState.BACKEND = backend
+    try:
+        if fen is None:
+            return GameState.generate_initial_game_state()
+        return GameState.generate_game_state_from_fen(fen)
+    finally:
+        GameState.BACKEND = previous_backend
+
+
+def verify_bitboard(fens: list) -> list:
+    """This function compares the bitboard backend with the mailbox backend on positions:
+    the moves and the general exposures of both teams, the legal moves of the team
+    to move, and the perft counts to PERFT_DEPTH. It returns the failures found"""
+    failures = []
+    for fen in fens:
+        board, _ = board_encoding.from_fen(fen)
+        if not bitboard.verify_against_mailbox(board):
+            failures.append("{}: moves or general exposure".format(fen))
+
+        mailbox_state = _create_game_state(fen, GameState.MAILBOX_BACKEND)
+        bitboard_state = _create_game_state(fen, GameState.BITBOARD_BACKEND)
+        if sorted(mailbox_state.status.valid_moves) != sorted(bitboard_state.status.valid_moves):
+            failures.append("{}: legal moves".format(fen))
+
+        for depth in range(1, PERFT_DEPTH + 1):
+            mailbox_nodes = perft(mailbox_state, depth, MAKE_METHOD)
+            bitboard_nodes = perft(bitboard_state, depth, MAKE_METHOD)
+            if mailbox_nodes != bitboard_nodes:
+                failures.append(
+                    "{}: perft({}) {} (mailbox) != {} (bitboard)".format(fen, depth, mailbox_nodes, bitboard_nodes)
+                )
+
+    return failures
+
+
+def verify_perft(fens: list) -> list:
+    """This function compares the perft counts of the initial position with
+    INITIAL_PERFT_COUNTS, for every method and every backend (the corpus is not used).
+    It returns the failures found"""
+    failures = []
+    for backend in BACKENDS:
+        for method in METHODS:
+            game_state = _create_game_state(None, backend)
+            for depth, expected_nodes in enumerate(INITIAL_PERFT_COUNTS, 1):
+                nodes = perft(game_state, depth, method)
+                if nodes != expected_nodes:
+                    failures.append(
+                        "{} {}: perft({}) {} != {}".format(backend, method, depth, nodes, expected_nodes)
+                    )
+
+    return failures
+
+
+def verify_batch_evaluation(fens: list) -> list:
+    """This function compares the values of the batch evaluation with GameState.value
+    on the positions and their children, in every value pack and through every path
+    of the batch evaluation: the static values summed with NumPy (if installed), the
+    static values of the boards one at a time, and the static value terms kept
+    by the game states. It returns the failures found"""
+    failures = []
+    for value_pack in range(NUMBER_OF_VALUE_PACKS):
+        # .Values of GameState.value, without the evaluation cache
+        EVALUATION_CACHE.clear()
+        expected_values = [game_state.value for game_state in _create_positions(fens, value_pack)]
+
+        paths = ["scalar", "terms"]
+        if batch_evaluation.numpy is not None:
+            paths.insert(0, "vectorized")
+        for path in paths:
+            EVALUATION_CACHE.clear()
+            game_states = _create_positions(fens, value_pack)
+            numpy = batch_evaluation.numpy
+            if path == "scalar":
+                batch_evaluation.numpy = None
+            elif path == "terms":
+                for game_state in game_states:
+                    game_state._value_terms = evaluation.get_value_terms(
+                        game_state.board, game_state.piece_squares, value_pack
+                    )
+            try:
+                values = batch_evaluation.evaluate_game_states(game_states)
+            finally:
+                batch_evaluation.numpy = numpy
+
+            for game_state, value, expected_value in zip(game_states, values, expected_values):
+                if value != expected_value:
+                    failures.append(
+                        "{} (value pack {}, {}): {} != {}".format(
+                            board_encoding.to_fen(game_state.board, game_state._current_team),
+                            value_pack,
+                            path,
+                            value,
+                            expected_value,
+                        )
+                    )
+
+    EVALUATION_CACHE.clear()
+    return failures
+
+
+def _create_positions(fens: list, value_pack: int) -> list:
+    """This function creates the game states of the positions and of their children,
+    without their static value terms"""
+    game_states = []
+    for fen in fens:
+        game_state = GameState.generate_game_state_from_fen(fen, value_pack)
+        game_states.append(game_state)
+        game_states.extend(child_game_state for child_game_state, _ in game_state.generate_all_game_states())
+    return game_states
+
+
+def main() -> None:
+    """This function runs the checks from the command line"""
+    parser = argparse.ArgumentParser(description="Verify the move generators on a corpus of positions")
+    parser.add_argument("--check", action="append", choices=CHECKS, help="check to run (all by default)")
+    parser.add_argument("--file", default=POSITIONS_FILE, help="file of positions, one FEN string per line")
+    args = parser.parse_args()
+
+    fens = load_positions(args.file)
+    number_of_failures = 0
+    for name in args.check or list(CHECKS):
+        failures = CHECKS[name](fens)
+        for failure in failures:
+            print("  " + failure)
+        print("{}: {}".format(name, "{} failures".format(len(failures)) if failures else "ok"))
+        number_of_failures += len(failures)
+
+    if number_of_failures > 0:
+        sys.exit(1)
+
+
+# [END FUNCTIONS]
+
+
+# [BEGIN CONSTANTS]
+# Checks by name
+CHECKS = {
+    "bitboard": verify_bitboard,
+    "perft": verify_perft,
+    "batch_evaluation": verify_batch_evaluation,
+}
+
+# [END CONSTANTS]
+
+
+if __name__ == "__main__":
+    main()
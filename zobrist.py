@@ -0,0 +1,52 @@
+"""Module providing the 64-bit Zobrist keys of the game states"""
+from random import Random
+from team import Team
+import board_encoding
+from board_encoding import MAILBOX_SIZE, RED, BLACK, GENERAL, PAWN
+
+# [BEGIN CONSTANTS]
+# Fixed seed, so that the keys are the same in every process and every run
+SEED = 2707
+
+_generator = Random(SEED)
+
+# PIECE_KEYS[code][square] is the key of a piece code on a mailbox square.
+# The row of the empty code is all zeros, so an empty square never changes a key.
+PIECE_KEYS = [[0] * MAILBOX_SIZE for _ in range((RED | BLACK) + 1)]
+for _colour in (RED, BLACK):
+    for _piece_type in range(GENERAL, PAWN + 1):
+        PIECE_KEYS[_colour | _piece_type] = [
+            _generator.getrandbits(64) for _ in range(MAILBOX_SIZE)
+        ]
+
+# Key of the side to move, included when the black team is to move
+SIDE_KEY = _generator.getrandbits(64)
+
+# [END CONSTANTS]
+
+
+# [BEGIN FUNCTIONS]
+def compute_key(board: list, current_team: Team) -> int:
+    """This function computes the Zobrist key of a board and a side to move from scratch"""
+    key = 0
+    for square in board_encoding.SQUARES:
+        key ^= PIECE_KEYS[board[square]][square]
+
+    if current_team is Team.BLACK:
+        key ^= SIDE_KEY
+
+    return key
+
+
+def get_move_key_delta(moved_code: int, captured_code: int, old_square: int, new_square: int) -> int:
+    """This function returns the value to XOR into a key to make a move on it"""
+    moved_keys = PIECE_KEYS[moved_code]
+    return (
+        moved_keys[old_square]
+        ^ moved_keys[new_square]
+        ^ PIECE_KEYS[captured_code][new_square]
+        ^ SIDE_KEY
+    )
+
+
+# [END FUNCTIONS]